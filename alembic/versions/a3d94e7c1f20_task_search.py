@@ -0,0 +1,67 @@
+"""task search
+
+Revision ID: a3d94e7c1f20
+Revises: 5f1c2a9d3b7e
+Create Date: 2024-05-20 12:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3d94e7c1f20'
+down_revision: Union[str, None] = '5f1c2a9d3b7e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Поиск идёт по выражению, а не по хранимой колонке: добавление
+# вычисляемой колонки переписало бы всю таблицу под ACCESS EXCLUSIVE.
+# Выражение должно совпадать с search_vector() в app/models/task.py.
+SEARCH_VECTOR = (
+    "to_tsvector('russian', coalesce(title, '') "
+    "|| ' ' || coalesce(description, ''))"
+)
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # CREATE INDEX CONCURRENTLY не может выполняться внутри транзакции,
+    # поэтому индексы создаются в autocommit-блоке без блокировки записи.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_task_title_trgm',
+            'task',
+            ['title'],
+            postgresql_using='gin',
+            postgresql_ops={'title': 'gin_trgm_ops'},
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        op.create_index(
+            'ix_task_search_vector',
+            'task',
+            [sa.text(SEARCH_VECTOR)],
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_task_search_vector',
+            table_name='task',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
+        op.drop_index(
+            'ix_task_title_trgm',
+            table_name='task',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
@@ -0,0 +1,60 @@
+"""task creator date index
+
+Revision ID: b4e8d2f19a63
+Revises: f7b3c6a1d482
+Create Date: 2024-05-27 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4e8d2f19a63'
+down_revision: Union[str, None] = 'f7b3c6a1d482'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Задачи создателя читаются страницами в порядке (create_date, id)
+# от новых к старым: составной индекс отдаёт страницу без сортировки
+# всех задач пользователя. ix_task_creator_id становится лишним.
+# CREATE INDEX CONCURRENTLY не может выполняться внутри транзакции,
+# поэтому индексы меняются в autocommit-блоке без блокировки записи.
+COLUMNS = ['creator_id', sa.text('create_date DESC'), sa.text('id DESC')]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_task_creator_id_create_date_id',
+            'task',
+            COLUMNS,
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        op.drop_index(
+            'ix_task_creator_id',
+            table_name='task',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_task_creator_id',
+            'task',
+            ['creator_id'],
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        op.drop_index(
+            'ix_task_creator_id_create_date_id',
+            table_name='task',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
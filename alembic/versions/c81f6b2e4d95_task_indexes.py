@@ -0,0 +1,68 @@
+"""task indexes
+
+Revision ID: c81f6b2e4d95
+Revises: a3d94e7c1f20
+Create Date: 2024-05-21 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c81f6b2e4d95'
+down_revision: Union[str, None] = 'a3d94e7c1f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# CREATE INDEX CONCURRENTLY не может выполняться внутри транзакции,
+# поэтому индексы создаются в autocommit-блоке без блокировки записи.
+INDEXES = (
+    ('ix_task_creator_id', 'task', ['creator_id'], {}),
+    ('ix_task_create_date_id', 'task', ['create_date', 'id'], {}),
+    (
+        'ix_task_expiration_date_active',
+        'task',
+        ['expiration_date'],
+        {'postgresql_where': sa.text('is_active')}
+    ),
+    (
+        'ix_task_responsibles_reference_user_id',
+        'task_responsibles_reference',
+        ['user_id', 'task_id'],
+        {}
+    ),
+    (
+        'ix_task_auditors_reference_user_id',
+        'task_auditors_reference',
+        ['user_id', 'task_id'],
+        {}
+    ),
+)
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, kwargs in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+                **kwargs
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True
+            )
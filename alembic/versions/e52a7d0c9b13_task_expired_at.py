@@ -0,0 +1,59 @@
+"""task expired_at
+
+Revision ID: e52a7d0c9b13
+Revises: c81f6b2e4d95
+Create Date: 2024-05-23 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e52a7d0c9b13'
+down_revision: Union[str, None] = 'c81f6b2e4d95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'task',
+        sa.Column('expired_at', sa.DateTime(), nullable=True)
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_task_expiration_date_unswept',
+            'task',
+            ['expiration_date'],
+            postgresql_where=sa.text('is_active AND expired_at IS NULL'),
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        op.create_index(
+            'ix_task_expired_at_id',
+            'task',
+            ['expired_at', 'id'],
+            postgresql_where=sa.text('expired_at IS NOT NULL'),
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_task_expired_at_id',
+            table_name='task',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
+        op.drop_index(
+            'ix_task_expiration_date_unswept',
+            table_name='task',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
+    op.drop_column('task', 'expired_at')
@@ -0,0 +1,174 @@
+"""task user stats
+
+Revision ID: f7b3c6a1d482
+Revises: e52a7d0c9b13
+Create Date: 2024-05-24 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7b3c6a1d482'
+down_revision: Union[str, None] = 'e52a7d0c9b13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Прибавить к счётчикам дельты из подзапроса со столбцами
+# (user_id, role, sign, is_active, expired_at). Строки блокируются
+# в порядке (user_id, role), чтобы параллельные триггеры
+# не попадали во взаимоблокировку.
+UPSERT = """
+    INSERT INTO task_user_stats AS s
+        (user_id, role, active_count, expired_count, closed_count)
+    SELECT
+        user_id,
+        role,
+        sum(CASE WHEN is_active AND expired_at IS NULL
+            THEN sign ELSE 0 END),
+        sum(CASE WHEN is_active AND expired_at IS NOT NULL
+            THEN sign ELSE 0 END),
+        sum(CASE WHEN NOT is_active THEN sign ELSE 0 END)
+    FROM ({deltas}) AS deltas
+    GROUP BY user_id, role
+    ORDER BY user_id, role
+    ON CONFLICT (user_id, role) DO UPDATE SET
+        active_count = s.active_count + EXCLUDED.active_count,
+        expired_count = s.expired_count + EXCLUDED.expired_count,
+        closed_count = s.closed_count + EXCLUDED.closed_count;
+"""
+
+TASK_DELTAS = """
+        SELECT creator_id AS user_id, 'creator' AS role,
+            sign, is_active, expired_at
+        FROM changed_tasks
+        UNION ALL
+        SELECT r.user_id, 'responsible', c.sign, c.is_active, c.expired_at
+        FROM changed_tasks c
+        JOIN task_responsibles_reference r ON r.task_id = c.id
+"""
+
+REFERENCE_DELTAS = """
+        SELECT r.user_id, 'responsible' AS role,
+            r.sign, t.is_active, t.expired_at
+        FROM changed_references r
+        JOIN task t ON t.id = r.task_id
+"""
+
+TASK_COLUMNS = 'id, creator_id, is_active, expired_at'
+
+# Триггеры с таблицами переходов могут обслуживать только одно событие,
+# поэтому на каждое событие заведена своя функция.
+TRIGGERS = {
+    ('task', 'INSERT', 'NEW TABLE AS new_rows'): (
+        f'WITH changed_tasks AS ('
+        f'SELECT 1 AS sign, {TASK_COLUMNS} FROM new_rows)'
+        + UPSERT.format(deltas=TASK_DELTAS)
+    ),
+    ('task', 'DELETE', 'OLD TABLE AS old_rows'): (
+        f'WITH changed_tasks AS ('
+        f'SELECT -1 AS sign, {TASK_COLUMNS} FROM old_rows)'
+        + UPSERT.format(deltas=TASK_DELTAS)
+    ),
+    ('task', 'UPDATE', 'OLD TABLE AS old_rows NEW TABLE AS new_rows'): (
+        """
+        WITH changed AS (
+            SELECT o.id
+            FROM old_rows o
+            JOIN new_rows n ON n.id = o.id
+            WHERE (o.creator_id, o.is_active, o.expired_at IS NULL)
+                IS DISTINCT FROM
+                (n.creator_id, n.is_active, n.expired_at IS NULL)
+        ), changed_tasks AS (
+            SELECT -1 AS sign, o.id, o.creator_id, o.is_active, o.expired_at
+            FROM old_rows o JOIN changed USING (id)
+            UNION ALL
+            SELECT 1, n.id, n.creator_id, n.is_active, n.expired_at
+            FROM new_rows n JOIN changed USING (id)
+        )"""
+        + UPSERT.format(deltas=TASK_DELTAS)
+    ),
+    (
+        'task_responsibles_reference',
+        'INSERT',
+        'NEW TABLE AS new_rows'
+    ): (
+        'WITH changed_references AS ('
+        'SELECT 1 AS sign, task_id, user_id FROM new_rows)'
+        + UPSERT.format(deltas=REFERENCE_DELTAS)
+    ),
+    (
+        'task_responsibles_reference',
+        'DELETE',
+        'OLD TABLE AS old_rows'
+    ): (
+        'WITH changed_references AS ('
+        'SELECT -1 AS sign, task_id, user_id FROM old_rows)'
+        + UPSERT.format(deltas=REFERENCE_DELTAS)
+    ),
+}
+
+BACKFILL = """
+    INSERT INTO task_user_stats
+        (user_id, role, active_count, expired_count, closed_count)
+    SELECT
+        user_id,
+        role,
+        count(*) FILTER (WHERE is_active AND expired_at IS NULL),
+        count(*) FILTER (WHERE is_active AND expired_at IS NOT NULL),
+        count(*) FILTER (WHERE NOT is_active)
+    FROM (
+        SELECT creator_id AS user_id, 'creator' AS role,
+            is_active, expired_at
+        FROM task
+        UNION ALL
+        SELECT r.user_id, 'responsible', t.is_active, t.expired_at
+        FROM task_responsibles_reference r
+        JOIN task t ON t.id = r.task_id
+    ) AS memberships
+    GROUP BY user_id, role
+"""
+
+
+def trigger_name(table: str, event: str) -> str:
+    return f'{table}_{event.lower()}_user_stats'
+
+
+def upgrade() -> None:
+    op.create_table(
+        'task_user_stats',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('role', sa.String(length=16), nullable=False),
+        sa.Column('active_count', sa.Integer(), nullable=False),
+        sa.Column('expired_count', sa.Integer(), nullable=False),
+        sa.Column('closed_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+        sa.PrimaryKeyConstraint('user_id', 'role')
+    )
+    for (table, event, referencing), body in TRIGGERS.items():
+        name = trigger_name(table, event)
+        op.execute(
+            f'CREATE FUNCTION {name}() RETURNS trigger '
+            f'LANGUAGE plpgsql AS $$ BEGIN {body} RETURN NULL; END $$'
+        )
+        op.execute(
+            f'CREATE TRIGGER {name} AFTER {event} ON {table} '
+            f'REFERENCING {referencing} '
+            f'FOR EACH STATEMENT EXECUTE FUNCTION {name}()'
+        )
+    op.execute(
+        'LOCK TABLE task, task_responsibles_reference IN SHARE MODE'
+    )
+    op.execute(BACKFILL)
+
+
+def downgrade() -> None:
+    for table, event, _ in TRIGGERS:
+        name = trigger_name(table, event)
+        op.execute(f'DROP TRIGGER IF EXISTS {name} ON {table}')
+        op.execute(f'DROP FUNCTION IF EXISTS {name}()')
+    op.drop_table('task_user_stats')
@@ -0,0 +1,137 @@
+"""
+Запуск сервера приложения: python -m app.
+
+Число воркеров по умолчанию равно числу доступных процессу ядер
+с учётом привязки процесса и квоты CPU контейнера. Пул соединений
+делится между воркерами так, чтобы их сумма не превышала
+DATABASE_MAX_CONNECTIONS. Реплики получают такие же пулы, поэтому
+лимит действует на каждый сервер отдельно: на основную базу и на
+каждую реплику (max_connections реплики по требованию PostgreSQL
+не меньше, чем у основной базы).
+
+По SIGTERM все воркеры одновременно перестают принимать соединения,
+дожидаются текущих запросов не дольше SERVER_GRACEFUL_TIMEOUT секунд
+и закрывают пулы соединений.
+
+При нескольких воркерах метрики собираются через общий каталог
+METRICS_MULTIPROCESS_DIR: если он не задан, создаётся временный
+и удаляется после остановки сервера. /metrics любого воркера
+отдаёт серии всех воркеров с меткой pid.
+"""
+import math
+import os
+import shutil
+import tempfile
+from typing import Tuple
+
+import uvicorn
+from uvicorn.supervisors import Multiprocess
+
+from app.core.config import configure_logger, settings
+
+logger = configure_logger('app.server')
+
+CGROUP_CPU_MAX = '/sys/fs/cgroup/cpu.max'
+
+
+class Supervisor(Multiprocess):
+    """
+    Родительский процесс воркеров uvicorn.
+    uvicorn останавливает воркеры по одному, дожидаясь каждого:
+    остальные тем временем принимают новые запросы, а остановка
+    длится до workers * SERVER_GRACEFUL_TIMEOUT. Здесь SIGTERM
+    получают сразу все воркеры.
+    """
+
+    def shutdown(self) -> None:
+        for process in self.processes:
+            process.terminate()
+        super().shutdown()
+
+
+def available_cpus() -> int:
+    """Получить число ядер, доступных процессу."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    try:
+        with open(CGROUP_CPU_MAX) as file:
+            quota, period = file.read().split()
+    except (OSError, ValueError):
+        return cpus
+    if quota == 'max':
+        return cpus
+    return max(1, min(cpus, math.ceil(int(quota) / int(period))))
+
+
+def worker_pool_limits(workers: int) -> Tuple[int, int]:
+    """
+    Получить pool_size и max_overflow одного воркера.
+    Без DATABASE_MAX_CONNECTIONS используются настройки как есть.
+    Кэш пользователей держит на воркер ещё одно соединение с LISTEN
+    вне пула, оно тоже входит в лимит.
+    """
+    pool_size = settings.database_pool_size
+    max_overflow = settings.database_max_overflow
+    if not settings.database_max_connections:
+        return pool_size, max_overflow
+    listeners = int(
+        settings.user_cache_size > 0 and settings.user_cache_ttl > 0
+    )
+    per_worker = settings.database_max_connections // workers - listeners
+    if per_worker < 1:
+        raise ValueError(
+            f'DATABASE_MAX_CONNECTIONS={settings.database_max_connections}'
+            f' не хватает на {workers} воркеров.'
+        )
+    pool_size = min(pool_size, per_worker)
+    return pool_size, min(max_overflow, per_worker - pool_size)
+
+
+def main() -> None:
+    workers = settings.server_workers or available_cpus()
+    pool_size, max_overflow = worker_pool_limits(workers)
+    # Воркеры запускаются новыми процессами и читают настройки
+    # из окружения, переменные окружения важнее файла .env.
+    os.environ['DATABASE_POOL_SIZE'] = str(pool_size)
+    os.environ['DATABASE_MAX_OVERFLOW'] = str(max_overflow)
+    metrics_dir = None
+    if (
+        workers > 1
+        and settings.metrics_enabled
+        and not settings.metrics_multiprocess_dir
+    ):
+        metrics_dir = tempfile.mkdtemp(prefix='app-metrics-')
+        os.environ['METRICS_MULTIPROCESS_DIR'] = metrics_dir
+    logger.info(
+        'Запуск %s воркеров, пул соединений на воркер: %s + %s',
+        workers, pool_size, max_overflow
+    )
+    config = uvicorn.Config(
+        'app.main:app',
+        host=settings.server_host,
+        port=settings.server_port,
+        workers=workers,
+        loop='uvloop',
+        http='httptools',
+        access_log=settings.server_access_log,
+        timeout_graceful_shutdown=settings.server_graceful_timeout,
+    )
+    server = uvicorn.Server(config)
+    try:
+        if workers > 1:
+            Supervisor(
+                config,
+                target=server.run,
+                sockets=[config.bind_socket()]
+            ).run()
+        else:
+            server.run()
+    finally:
+        if metrics_dir is not None:
+            shutil.rmtree(metrics_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,2 +1,5 @@
 from app.api.endpoints.user import router as user_router  # noqa
 from app.api.endpoints.task import router as task_router  # noqa
+from app.api.endpoints.health import router as health_router  # noqa
+from app.api.endpoints.internal import router as internal_router  # noqa
+from app.api.endpoints.metrics import router as metrics_router  # noqa
@@ -0,0 +1,31 @@
+from fastapi import APIRouter, status
+from fastapi.responses import ORJSONResponse
+
+from app.core.warmup import readiness
+
+
+router = APIRouter()
+
+
+@router.get('/live', status_code=status.HTTP_200_OK)
+async def get_liveness():
+    """Проверить, что воркер отвечает."""
+    return {'status': 'alive'}
+
+
+@router.get('/ready', status_code=status.HTTP_200_OK)
+async def get_readiness():
+    """
+    Проверить, что воркер прогрет и готов принимать запросы.
+    До окончания прогрева возвращается 503.
+    """
+    return ORJSONResponse(
+        {
+            'status': 'ready' if readiness.ready else 'warming_up',
+            'phases_ms': readiness.phases,
+        },
+        status_code=(
+            status.HTTP_200_OK if readiness.ready
+            else status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+    )
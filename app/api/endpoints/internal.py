@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends, status
+
+from app.core.db import engine
+from app.core.pool import pool_snapshot
+from app.core.user import current_superuser
+from app.schemas.internal import PoolStatsRead
+
+
+router = APIRouter()
+
+
+@router.get(
+    '/db-stats',
+    response_model=PoolStatsRead,
+    dependencies=[Depends(current_superuser)],
+    status_code=status.HTTP_200_OK
+)
+async def get_db_stats():
+    """Получить статистику пула соединений с базой данных."""
+    return pool_snapshot(engine)
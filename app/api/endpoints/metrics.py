@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Response
+
+from app.core.metrics import shared_metrics
+
+
+router = APIRouter()
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+@router.get('/metrics', include_in_schema=False)
+async def get_metrics():
+    """
+    Получить метрики в текстовом формате Prometheus.
+    При нескольких воркерах отдаются серии всех воркеров с меткой pid,
+    поэтому на общий порт достаточно одной цели сбора.
+    """
+    return Response(
+        content=shared_metrics.collect(),
+        media_type=PROMETHEUS_CONTENT_TYPE
+    )
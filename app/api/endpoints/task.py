@@ -1,20 +1,45 @@
 from datetime import date, datetime
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import (
+    APIRouter, Body, Depends, Header, HTTPException, Query, Response, status
+)
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.etag import etag_matches, make_etag, not_modified, set_etag
+from app.api.export import to_csv, to_ndjson
+from app.api.serializers import dump_task, dump_task_page
 from app.api.validators import (
+    validate_cursor,
     validate_is_task_creator_or_superuser,
+    validate_task_editable,
     validate_task_exist,
     validate_user_is_superuser
 )
-from app.core.config import configure_logger
-from app.core.db import get_async_session
+from app.core.config import configure_logger, settings
+from app.core.db import AsyncSessionLocal, get_async_session
+from app.core.pagination import encode_cursor, make_page
+from app.core.replica import get_read_session, replica_router
 from app.core.user import current_user
+from app.crud.stats import task_stats_crud
 from app.crud.task import task_crud
 from app.models.user import User
-from app.schemas.task import TaskCreate, TaskUpdate, TaskRead
+from app.schemas.task import (
+    TaskBulkCreateResult,
+    TaskBulkUpdate,
+    TaskBulkUpdateResult,
+    TaskCreate,
+    TaskExportFormat,
+    TaskMemberRole,
+    TaskPage,
+    TaskRead,
+    TaskSearchResult,
+    TaskStats,
+    TaskUpdate,
+    TaskUserRole
+)
 
 
 router = APIRouter()
@@ -25,11 +50,11 @@ logger = configure_logger(__name__)
     '/',
     response_model=TaskRead,
     response_model_exclude_none=True,
-    dependencies=[Depends(current_user)],
     status_code=status.HTTP_201_CREATED
 )
 async def create_new_task(
         task: TaskCreate,
+        response: Response,
         user: User = Depends(current_user),
         session: AsyncSession = Depends(get_async_session)
 ):
@@ -40,23 +65,82 @@ async def create_new_task(
             session=session,
             user=user
         )
-        logger.info(f'Создана задача {task.id}')
+        replica_router.pin_to_primary(user.id, response)
+        logger.info(
+            'Создана задача %s', task['id'],
+            extra={'task_id': task['id']}
+        )
         return task
+    except ValueError as e:
+        await session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         await session.rollback()
-        logger.error(f'Ошибка при создании задачи - {e}')
+        logger.error('Ошибка при создании задачи - %s', e)
         raise e
 
 
+@router.post(
+    '/bulk',
+    response_model=TaskBulkCreateResult,
+    response_model_exclude_none=True,
+    status_code=status.HTTP_201_CREATED
+)
+async def create_tasks_bulk(
+    response: Response,
+    tasks: List[TaskCreate] = Body(
+        ...,
+        min_length=1,
+        max_length=settings.task_bulk_max_items,
+    ),
+    partial: bool = Query(
+        False,
+        description=(
+            'Создать корректные задачи, пропустив задачи с ошибками,'
+            ' вместо отказа от всей пачки'
+        )
+    ),
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """Создать пачку задач в одной транзакции."""
+    try:
+        created, errors = await task_crud.create_bulk(
+            objs_in=tasks,
+            user=user,
+            session=session,
+            partial=partial
+        )
+    except Exception as e:
+        await session.rollback()
+        logger.error('Ошибка при пакетном создании задач - %s', e)
+        raise e
+    replica_router.pin_to_primary(user.id, response)
+
+    if errors and not partial:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=errors
+        )
+    logger.info(
+        'Пользователем %s создано задач: %s, пропущено: %s',
+        user.id, len(created), len(errors)
+    )
+    return {'created': created, 'errors': errors}
+
+
 @router.get(
     '/',
-    response_model=List[TaskRead],
+    response_model=TaskPage,
     response_model_exclude_none=True,
     dependencies=[Depends(current_user)],
     status_code=status.HTTP_200_OK
 )
 async def get_all_tasks(
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_read_session),
     title: Optional[str] = Query(
         None,
         min_length=1,
@@ -79,14 +163,327 @@ async def get_all_tasks(
             ' задач по дате создания'
         )
     ),
+    limit: int = Query(
+        settings.task_page_default_limit,
+        ge=1,
+        le=settings.task_page_max_limit,
+        description='Количество задач на странице'
+    ),
+    cursor: Optional[str] = Query(
+        None,
+        description=(
+            'Курсор следующей страницы из поля'
+            ' next_cursor предыдущего ответа'
+        )
+    ),
+    if_none_match: Optional[str] = Header(None),
 ):
+    """
+    Получить страницу задач, отсортированных от новых к старым.
+    Если страница не менялась с версии из If-None-Match - вернуть 304.
+    """
+    cursor_key = validate_cursor(cursor)
+
+    def page_etag(version) -> str:
+        return make_etag(
+            'tasks', title, start_date, end_date, limit, cursor, version
+        )
+
+    # Версия страницы - id и даты обновления её задач. Отдельным
+    # запросом она читается только для условного запроса.
+    if if_none_match:
+        etag = page_etag(await task_crud.get_page_version(
+            session=session,
+            title=title,
+            start_date=start_date,
+            end_date=end_date,
+            limit=limit + 1,
+            cursor=cursor_key,
+        ))
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
     tasks = await task_crud.filter_tasks(
         session=session,
         title=title,
         start_date=start_date,
-        end_date=end_date
+        end_date=end_date,
+        limit=limit + 1,
+        cursor=cursor_key,
+    )
+    etag = page_etag([(task.id, task.update_date) for task in tasks])
+    items, next_cursor = make_page(
+        tasks,
+        limit,
+        sort_key=lambda task: task.create_date
+    )
+    # Ответ собирается напрямую из загруженных объектов, минуя
+    # валидацию response_model: это основной поток данных сервиса.
+    response = ORJSONResponse(dump_task_page(items, next_cursor))
+    set_etag(response, etag)
+    return response
+
+
+@router.get(
+    '/mine',
+    response_model=TaskPage,
+    response_model_exclude_none=True,
+    status_code=status.HTTP_200_OK
+)
+async def get_my_tasks(
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_read_session),
+    role: TaskUserRole = Query(
+        TaskUserRole.any,
+        description=(
+            'Роль пользователя в задаче: постановщик, ответственный,'
+            ' наблюдатель или любая'
+        )
+    ),
+    title: Optional[str] = Query(
+        None,
+        min_length=1,
+        description=(
+            'Название, или его часть, для'
+            ' фильтрации задач по названию'
+        )
+    ),
+    start_date: Optional[date] = Query(
+        None,
+        description=(
+            'Начальная дата для фильтрации'
+            ' задач по дате создания'
+        )
+    ),
+    end_date: Optional[date] = Query(
+        None,
+        description=(
+            'Конечная дата для фильтрации'
+            ' задач по дате создания'
+        )
+    ),
+    limit: int = Query(
+        settings.task_page_default_limit,
+        ge=1,
+        le=settings.task_page_max_limit,
+        description='Количество задач на странице'
+    ),
+    cursor: Optional[str] = Query(
+        None,
+        description=(
+            'Курсор следующей страницы из поля'
+            ' next_cursor предыдущего ответа'
+        )
+    ),
+):
+    """Получить страницу задач, в которых участвует текущий пользователь."""
+    tasks = await task_crud.get_tasks_by_user_id(
+        session=session,
+        user_id=user.id,
+        role=role,
+        title=title,
+        start_date=start_date,
+        end_date=end_date,
+        limit=limit + 1,
+        cursor=validate_cursor(cursor),
+    )
+    items, next_cursor = make_page(
+        tasks,
+        limit,
+        sort_key=lambda task: task.create_date
     )
-    return tasks
+    return ORJSONResponse(dump_task_page(items, next_cursor))
+
+
+@router.get(
+    '/export',
+    response_class=StreamingResponse,
+    dependencies=[Depends(current_user)],
+    status_code=status.HTTP_200_OK
+)
+async def export_tasks(
+    format: TaskExportFormat = Query(
+        TaskExportFormat.ndjson,
+        description='Формат выгрузки'
+    ),
+    title: Optional[str] = Query(
+        None,
+        min_length=1,
+        description=(
+            'Название, или его часть, для'
+            ' фильтрации задач по названию'
+        )
+    ),
+    start_date: Optional[date] = Query(
+        None,
+        description=(
+            'Начальная дата для фильтрации'
+            ' задач по дате создания'
+        )
+    ),
+    end_date: Optional[date] = Query(
+        None,
+        description=(
+            'Конечная дата для фильтрации'
+            ' задач по дате создания'
+        )
+    ),
+):
+    """
+    Выгрузить все задачи в формате NDJSON или CSV.
+    Строки читаются серверным курсором и отправляются клиенту
+    по мере получения, не накапливаясь в памяти.
+    """
+    serialize = to_csv if format == TaskExportFormat.csv else to_ndjson
+
+    async def stream():
+        # Сессия открывается внутри генератора: зависимости с yield
+        # закрываются до того, как начнётся отправка тела ответа.
+        async with AsyncSessionLocal() as session:
+            partitions = task_crud.stream_tasks(
+                session=session,
+                title=title,
+                start_date=start_date,
+                end_date=end_date,
+                fetch_size=settings.task_export_fetch_size,
+            )
+            async for chunk in serialize(partitions):
+                yield chunk
+
+    if format == TaskExportFormat.csv:
+        media_type = 'text/csv'
+    else:
+        media_type = 'application/x-ndjson'
+    return StreamingResponse(
+        stream(),
+        media_type=media_type,
+        headers={
+            'Content-Disposition': (
+                f'attachment; filename="tasks.{format.value}"'
+            )
+        }
+    )
+
+
+@router.get(
+    '/search',
+    response_model=List[TaskSearchResult],
+    response_model_exclude_none=True,
+    dependencies=[Depends(current_user)],
+    status_code=status.HTTP_200_OK
+)
+async def search_tasks(
+    session: AsyncSession = Depends(get_read_session),
+    q: str = Query(
+        ...,
+        min_length=1,
+        description=(
+            'Поисковый запрос по названию и описанию задач,'
+            ' поддерживает синтаксис websearch'
+        )
+    ),
+    limit: int = Query(
+        settings.task_page_default_limit,
+        ge=1,
+        le=settings.task_page_max_limit,
+        description='Максимальное количество результатов'
+    ),
+):
+    """Найти задачи, отсортированные по релевантности."""
+    results = await task_crud.search(
+        session=session,
+        text=q,
+        limit=limit,
+    )
+    return ORJSONResponse([
+        {'task': dump_task(task), 'rank': rank, 'snippet': snippet}
+        for task, rank, snippet in results
+    ])
+
+
+@router.get(
+    '/expired',
+    response_model=TaskPage,
+    response_model_exclude_none=True,
+    dependencies=[Depends(current_user)],
+    status_code=status.HTTP_200_OK
+)
+async def get_expired_tasks(
+    session: AsyncSession = Depends(get_read_session),
+    since: Optional[datetime] = Query(
+        None,
+        description=(
+            'Вернуть задачи, истечение срока которых'
+            ' зафиксировано после этого момента'
+        )
+    ),
+    limit: int = Query(
+        settings.task_page_default_limit,
+        ge=1,
+        le=settings.task_page_max_limit,
+        description='Количество задач на странице'
+    ),
+    cursor: Optional[str] = Query(
+        None,
+        description=(
+            'Курсор следующей страницы из поля'
+            ' next_cursor предыдущего ответа'
+        )
+    ),
+):
+    """
+    Получить задачи с истёкшим сроком в порядке фиксации истечения.
+    Курсор возвращается и для последней страницы: с ним можно позже
+    продолжить чтение с места остановки.
+    """
+    tasks = await task_crud.get_expired(
+        session=session,
+        since=since,
+        limit=limit + 1,
+        cursor=validate_cursor(cursor),
+    )
+    items, next_cursor = make_page(
+        tasks,
+        limit,
+        sort_key=lambda task: task.expired_at
+    )
+    if next_cursor is None and items:
+        next_cursor = encode_cursor(items[-1].expired_at, items[-1].id)
+    return ORJSONResponse(dump_task_page(items, next_cursor))
+
+
+@router.get(
+    '/stats',
+    response_model=TaskStats,
+    dependencies=[Depends(current_user)],
+    status_code=status.HTTP_200_OK
+)
+async def get_task_stats(
+    session: AsyncSession = Depends(get_read_session),
+    limit: int = Query(
+        settings.task_page_default_limit,
+        ge=1,
+        le=settings.task_page_max_limit,
+        description='Количество пользователей в каждом списке'
+    ),
+):
+    """
+    Получить сводную статистику задач: общие счётчики и пользователей
+    с наибольшим числом активных задач в ролях создателя и ответственного.
+    """
+    return ORJSONResponse({
+        'total': await task_stats_crud.get_totals(session=session),
+        'creators': await task_stats_crud.get_by_role(
+            session=session,
+            role='creator',
+            limit=limit
+        ),
+        'responsibles': await task_stats_crud.get_by_role(
+            session=session,
+            role='responsible',
+            limit=limit
+        ),
+    })
 
 
 @router.get(
@@ -98,29 +495,94 @@ async def get_all_tasks(
 )
 async def get_task(
     task_id: int,
+    response: Response,
     session: AsyncSession = Depends(
-        get_async_session
+        get_read_session
     ),
+    if_none_match: Optional[str] = Header(None),
 ):
-    """Получить задачу."""
+    """
+    Получить задачу.
+    Если задача не менялась с версии из If-None-Match - вернуть 304
+    без загрузки связей и сериализации.
+    """
+    if if_none_match:
+        update_date = await task_crud.get_update_date(
+            task_id=task_id,
+            session=session
+        )
+        if update_date is not None:
+            etag = make_etag('task', task_id, update_date)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+
     task = await validate_task_exist(
         task_id=task_id,
         session=session
     )
+    set_etag(response, make_etag('task', task.id, task.update_date))
 
     return task
 
 
+@router.patch(
+    '/bulk',
+    response_model=TaskBulkUpdateResult,
+    status_code=status.HTTP_200_OK
+)
+async def update_tasks_bulk(
+    task_update: TaskBulkUpdate,
+    response: Response,
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Изменить или закрыть пачку задач по списку id и/или фильтру.
+    Задачи, где пользователь не постановщик, пропускаются.
+    """
+    if task_update.changes.creator_id:
+        validate_user_is_superuser(
+            user=user,
+        )
+
+    try:
+        updated = await task_crud.update_bulk(
+            obj_in=task_update,
+            user=user,
+            session=session,
+        )
+    except Exception as e:
+        await session.rollback()
+        logger.error('Ошибка при пакетном обновлении задач - %s', e)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f'Ошибка при пакетном обновлении задач - {str(e)}'
+        )
+    replica_router.pin_to_primary(user.id, response)
+
+    logger.info(
+        'Пользователем %s изменено задач: %s', user.id, len(updated)
+    )
+    skipped = []
+    if task_update.ids is not None:
+        updated_ids = set(updated)
+        skipped = [
+            task_id for task_id in dict.fromkeys(task_update.ids)
+            if task_id not in updated_ids
+        ]
+    return {'updated': updated, 'skipped': skipped}
+
+
 @router.patch(
     '/{task_id}',
     response_model=TaskRead,
     response_model_exclude_none=True,
-    dependencies=[Depends(current_user)],
     status_code=status.HTTP_200_OK
 )
 async def update_task(
     task_id: int,
     task_update: TaskUpdate,
+    response: Response,
     user: User = Depends(current_user),
     session: AsyncSession = Depends(get_async_session),
 ):
@@ -140,9 +602,10 @@ async def update_task(
         )
 
     if task_update.finished:
-        task_update['is_active'] = False
-        task_update['close_date'] = datetime.now()
-        logger.info(f'Задача {task.id} закрыта пользователем {user.id}')
+        logger.info(
+            'Задача %s закрыта пользователем %s', task.id, user.id,
+            extra={'task_id': task.id}
+        )
 
     try:
         await task_crud.update(
@@ -152,11 +615,15 @@ async def update_task(
         )
     except Exception as e:
         await session.rollback()
-        logger.error(f'Ошибка при обновлении задачи - {str(e)}')
+        logger.error(
+            'Ошибка при обновлении задачи - %s', e,
+            extra={'task_id': task_id}
+        )
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f'Ошибка при обновлении задачи - {str(e)}'
         )
+    replica_router.pin_to_primary(user.id, response)
     return task
 
 
@@ -164,11 +631,11 @@ async def update_task(
     '/{task_id}',
     response_model=TaskRead,
     response_model_exclude_none=True,
-    dependencies=[Depends(current_user)],
     status_code=status.HTTP_200_OK
 )
 async def delete_task(
     task_id: int,
+    response: Response,
     user: User = Depends(current_user),
     session: AsyncSession = Depends(get_async_session),
 ):
@@ -187,12 +654,101 @@ async def delete_task(
             db_obj=task,
             session=session,
         )
-        logger.info(f'Задача {task.id} удалена пользователем {user.id}')
+        replica_router.pin_to_primary(user.id, response)
+        logger.info(
+            'Задача %s удалена пользователем %s', task.id, user.id,
+            extra={'task_id': task.id}
+        )
         return task
     except Exception as e:
         await session.rollback()
-        logger.error(f'Ошибка при удалении задачи {task.id} - {str(e)}')
+        logger.error(
+            'Ошибка при удалении задачи %s - %s', task.id, e,
+            extra={'task_id': task.id}
+        )
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f'Ошибка при удалении задачи {task.id} - {str(e)}'
         )
+
+
+@router.post(
+    '/{task_id}/{role}/{user_id}',
+    status_code=status.HTTP_204_NO_CONTENT
+)
+async def add_task_member(
+    task_id: int,
+    role: TaskMemberRole,
+    user_id: int,
+    response: Response,
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """Добавить пользователя в ответственные или наблюдатели задачи."""
+    await validate_task_editable(
+        task_id=task_id,
+        user=user,
+        session=session
+    )
+
+    try:
+        added = await task_crud.add_member(
+            task_id=task_id,
+            user_id=user_id,
+            role=role,
+            session=session,
+        )
+    except IntegrityError:
+        await session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail='Пользователь с данным id не найден.'
+        )
+    if added:
+        replica_router.pin_to_primary(user.id, response)
+        logger.info(
+            'Пользователь %s добавлен в %s задачи %s',
+            user_id, role.value, task_id,
+            extra={'task_id': task_id}
+        )
+
+
+@router.delete(
+    '/{task_id}/{role}/{user_id}',
+    status_code=status.HTTP_204_NO_CONTENT
+)
+async def remove_task_member(
+    task_id: int,
+    role: TaskMemberRole,
+    user_id: int,
+    response: Response,
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """Удалить пользователя из ответственных или наблюдателей задачи."""
+    await validate_task_editable(
+        task_id=task_id,
+        user=user,
+        session=session
+    )
+
+    removed = await task_crud.remove_member(
+        task_id=task_id,
+        user_id=user_id,
+        role=role,
+        session=session,
+    )
+    if not removed:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=(
+                'Пользователь не состоит в задаче в данной роли'
+                ' или является её единственным ответственным.'
+            )
+        )
+    replica_router.pin_to_primary(user.id, response)
+    logger.info(
+        'Пользователь %s удалён из %s задачи %s',
+        user_id, role.value, task_id,
+        extra={'task_id': task_id}
+    )
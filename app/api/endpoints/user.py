@@ -1,6 +1,6 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response, status
 
-from app.core.user import auth_backend, fastapi_users
+from app.core.user import auth_backend, fastapi_users, jwt_strategy
 from app.schemas.user import (UserCreate,
                               UserRead,
                               UserUpdate)
@@ -25,6 +25,27 @@ def delete_user(id: str):
     )
 
 
+@router.get(
+    '/auth/jwt/public-key',
+    tags=['auth'],
+    status_code=status.HTTP_200_OK
+)
+async def get_jwt_public_key():
+    """
+    Получить открытый ключ для проверки токенов другими сервисами.
+    Доступен только при подписи токенов закрытым ключом (ES256, EdDSA).
+    """
+    if jwt_strategy.public_key is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail='Токены подписываются общим секретом.'
+        )
+    return Response(
+        content=jwt_strategy.public_key,
+        media_type='application/x-pem-file'
+    )
+
+
 router.include_router(
     fastapi_users.get_auth_router(auth_backend),
     prefix='/auth/jwt',
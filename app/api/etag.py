@@ -0,0 +1,41 @@
+import hashlib
+from typing import Optional
+
+from fastapi import Response, status
+
+CACHE_CONTROL = 'private, no-cache'
+
+
+def make_etag(*parts) -> str:
+    """Вычислить слабый ETag по значениям, определяющим версию ответа."""
+    digest = hashlib.blake2b(
+        '|'.join(map(str, parts)).encode(),
+        digest_size=12
+    ).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Проверить заголовок If-None-Match слабым сравнением ETag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    opaque = etag.removeprefix('W/')
+    return any(
+        tag.strip().removeprefix('W/') == opaque
+        for tag in if_none_match.split(',')
+    )
+
+
+def set_etag(response: Response, etag: str) -> None:
+    """Добавить ETag и требование ревалидации к ответу."""
+    response.headers['ETag'] = etag
+    response.headers['Cache-Control'] = CACHE_CONTROL
+
+
+def not_modified(etag: str) -> Response:
+    """Получить пустой ответ 304 Not Modified."""
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_etag(response, etag)
+    return response
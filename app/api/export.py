@@ -0,0 +1,55 @@
+import csv
+import io
+from typing import AsyncIterator, Sequence
+
+import orjson
+from sqlalchemy import RowMapping
+
+EXPORT_FIELDS = (
+    'id',
+    'title',
+    'description',
+    'is_active',
+    'creator_id',
+    'responsibles',
+    'auditors',
+    'create_date',
+    'update_date',
+    'close_date',
+    'expiration_date',
+)
+
+
+async def to_ndjson(
+    partitions: AsyncIterator[Sequence[RowMapping]]
+) -> AsyncIterator[bytes]:
+    """Сериализовать пачки строк в NDJSON, по одному объекту на строку."""
+    async for rows in partitions:
+        yield b''.join(
+            orjson.dumps(dict(row), option=orjson.OPT_APPEND_NEWLINE)
+            for row in rows
+        )
+
+
+async def to_csv(
+    partitions: AsyncIterator[Sequence[RowMapping]]
+) -> AsyncIterator[str]:
+    """
+    Сериализовать пачки строк в CSV с заголовком.
+    Списки идентификаторов пользователей записываются через ';'.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    yield buffer.getvalue()
+
+    async for rows in partitions:
+        buffer.seek(0)
+        buffer.truncate()
+        for row in rows:
+            writer.writerow(
+                ';'.join(map(str, value)) if isinstance(value, list)
+                else value
+                for value in (row[field] for field in EXPORT_FIELDS)
+            )
+        yield buffer.getvalue()
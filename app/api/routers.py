@@ -1,6 +1,11 @@
 from fastapi import APIRouter
 
+from app.core.config import settings
+
 from app.api.endpoints import (
+    health_router,
+    internal_router,
+    metrics_router,
     task_router,
     user_router
 )
@@ -10,3 +15,11 @@ main_router = APIRouter()
 
 main_router.include_router(task_router, prefix='/tasks', tags=['tasks'])
 main_router.include_router(user_router)
+main_router.include_router(health_router, prefix='/health', tags=['health'])
+main_router.include_router(
+    internal_router,
+    prefix='/internal',
+    tags=['internal']
+)
+if settings.metrics_enabled:
+    main_router.include_router(metrics_router, tags=['metrics'])
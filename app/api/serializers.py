@@ -0,0 +1,42 @@
+from typing import Optional
+
+from app.models.task import Task
+from app.models.user import User
+
+
+def dump_user(user: User) -> dict:
+    """Представить пользователя в задаче как UserTaskRepresentation."""
+    return {'id': user.id, 'email': user.email}
+
+
+def dump_task(task: Task) -> dict:
+    """
+    Представить задачу как TaskRead без валидации pydantic.
+    Данные загружены из базы данных и заведомо корректны,
+    поля со значением None опускаются, как при
+    response_model_exclude_none.
+    """
+    data = {
+        'id': task.id,
+        'title': task.title,
+        'description': task.description,
+        'expiration_date': task.expiration_date,
+        'creator': dump_user(task.creator),
+        'responsibles': [dump_user(user) for user in task.responsibles],
+        'auditors': [dump_user(user) for user in task.auditors],
+        'is_active': task.is_active,
+        'create_date': task.create_date,
+        'update_date': task.update_date,
+        'close_date': task.close_date,
+        'is_expired': task.is_expired,
+        'expired_at': task.expired_at,
+    }
+    return {key: value for key, value in data.items() if value is not None}
+
+
+def dump_task_page(tasks, next_cursor: Optional[str]) -> dict:
+    """Представить страницу задач как TaskPage без валидации pydantic."""
+    page = {'items': [dump_task(task) for task in tasks]}
+    if next_cursor is not None:
+        page['next_cursor'] = next_cursor
+    return page
@@ -1,8 +1,10 @@
-from typing import Optional
+from datetime import datetime
+from typing import Optional, Tuple
 
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.pagination import decode_cursor
 from app.crud.task import task_crud
 from app.models.task import Task
 from app.models.user import User
@@ -40,6 +42,31 @@ async def validate_task_exist(
     return task
 
 
+async def validate_task_editable(
+    task_id: int,
+    user: User,
+    session: AsyncSession
+) -> None:
+    """
+    Проверить, что задача существует и пользователь может её
+    редактировать, не загружая задачу целиком.
+    """
+    creator_id = await task_crud.get_creator_id(
+        task_id=task_id,
+        session=session
+    )
+    if creator_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail='Задача с данным id не найдена.'
+        )
+    if user.id != creator_id and not user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail='Нельзя редактировать чужие задачи.'
+        )
+
+
 def validate_user_is_superuser(
     user: User
 ):
@@ -48,3 +75,18 @@ def validate_user_is_superuser(
             status_code=status.HTTP_403_FORBIDDEN,
             detail='Недостаточно прав для выполнения запроса.'
         )
+
+
+def validate_cursor(
+    cursor: Optional[str]
+) -> Optional[Tuple[datetime, int]]:
+    """Проверить курсор пагинации и вернуть закодированный в нём ключ."""
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='Некорректный курсор пагинации.'
+        )
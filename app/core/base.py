@@ -1,3 +1,4 @@
 from app.core.db import Base  # noqa
 from app.models.task import Task  # noqa
 from app.models.user import User  # noqa
+from app.models.stats import task_user_stats  # noqa
@@ -1,7 +1,10 @@
 import logging
+from typing import List, Optional
 
 from pydantic_settings import BaseSettings
 
+from app.core.log import setup_logging
+
 
 class Settings(BaseSettings):
     """Класс для базовых настроек приложения."""
@@ -9,10 +12,37 @@ class Settings(BaseSettings):
     app_title: str
     database_url: str
 
+    database_pool_size: int = 5
+    database_max_overflow: int = 10
+    database_pool_timeout: float = 30
+    database_pool_pre_ping: bool = False
+    database_pool_recycle: int = -1
+    database_statement_cache_size: int = 100
+    database_max_connections: int = 0
+
+    database_replica_urls: List[str] = []
+    database_replica_connect_timeout: float = 2
+    database_replica_retry_interval: int = 30
+    read_your_writes_window: int = 10
+    read_your_writes_cache_size: int = 10000
+
     jwt_secret: str = 'secret'
+    jwt_algorithm: str = 'HS256'
+    jwt_private_key_path: Optional[str] = None
+    jwt_public_key_path: Optional[str] = None
     token_lifetime: int = 3600
+    token_cache_size: int = 10000
 
     password_min_length: int = 8
+    password_hash_workers: int = 2
+    password_hash_max_pending: int = 100
+    password_argon2_time_cost: int = 3
+    password_argon2_memory_cost: int = 65536
+    password_argon2_parallelism: int = 4
+
+    user_cache_size: int = 1024
+    user_cache_ttl: int = 60
+    user_cache_listen_retry_interval: float = 5
 
     first_superuser_email: str
     first_superuser_password: str
@@ -20,7 +50,41 @@ class Settings(BaseSettings):
     task_title_min_length: int = 1
     task_title_max_length: int = 255
 
+    task_page_default_limit: int = 50
+    task_page_max_limit: int = 500
+    task_export_fetch_size: int = 1000
+    task_bulk_max_items: int = 500
+
+    warmup_connections: int = 5
+    warmup_retry_interval: int = 5
+
+    server_host: str = '0.0.0.0'
+    server_port: int = 8888
+    server_workers: int = 0
+    server_graceful_timeout: int = 30
+    server_access_log: bool = True
+
+    task_expiry_sweep_enabled: bool = True
+    task_expiry_sweep_interval: int = 60
+    task_expiry_sweep_batch_size: int = 1000
+    task_stats_reconcile_enabled: bool = False
+    task_stats_reconcile_interval: int = 86400
+
+    metrics_enabled: bool = True
+    metrics_multiprocess_dir: Optional[str] = None
+    metrics_flush_interval: float = 5
+
+    query_debug_enabled: bool = False
+    query_debug_sample_rate: float = 1.0
+    slow_query_threshold_ms: float = 200
+    slow_query_explain: bool = True
+    n_plus_one_threshold: int = 5
+
     logging_format: str = '%(asctime)s - %(levelname)s - %(message)s'
+    logging_level: str = 'INFO'
+    logging_json: bool = False
+    logging_queue_size: int = 10000
+    logging_requests: bool = False
 
     class Config:
         env_file = '.env'
@@ -31,17 +95,17 @@ settings = Settings()
 
 
 def configure_logger(name) -> logging.Logger:
-    """Настроить логгер."""
-
-    logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
-
-    handler = logging.StreamHandler()
-    handler.setLevel(logging.INFO)
-    formatter = logging.Formatter(
-        settings.logging_format
+    """
+    Получить логгер, пишущий через общий конвейер с очередью.
+    Повторные вызовы не добавляют обработчиков.
+    """
+    handler = setup_logging(
+        fmt=settings.logging_format,
+        json_output=settings.logging_json,
+        queue_size=settings.logging_queue_size,
     )
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
-
+    logger = logging.getLogger(name)
+    logger.setLevel(settings.logging_level)
+    if handler not in logger.handlers:
+        logger.addHandler(handler)
     return logger
@@ -1,8 +1,12 @@
 from sqlalchemy import Column, Integer
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import declarative_base, declared_attr, sessionmaker
 
 from app.core.config import settings
+from app.core.metrics import instrument_statements
+from app.core.pool import InstrumentedAsyncPool, instrument_pool
+from app.core.query_debug import instrument_queries
 
 
 class PreBase:
@@ -16,8 +20,35 @@ class PreBase:
     id = Column(Integer, primary_key=True)
 
 
+def engine_options(database_url: str) -> dict:
+    """Собрать параметры движка и пула соединений из настроек."""
+    options = dict(
+        poolclass=InstrumentedAsyncPool,
+        pool_size=settings.database_pool_size,
+        max_overflow=settings.database_max_overflow,
+        pool_timeout=settings.database_pool_timeout,
+        pool_pre_ping=settings.database_pool_pre_ping,
+        pool_recycle=settings.database_pool_recycle,
+    )
+    if make_url(database_url).get_driver_name() == 'asyncpg':
+        options['connect_args'] = {
+            'prepared_statement_cache_size': (
+                settings.database_statement_cache_size
+            ),
+        }
+    return options
+
+
 Base = declarative_base(cls=PreBase)
-engine = create_async_engine(settings.database_url)
+engine = create_async_engine(
+    settings.database_url,
+    **engine_options(settings.database_url)
+)
+instrument_pool(engine)
+if settings.metrics_enabled:
+    instrument_statements(engine)
+if settings.query_debug_enabled:
+    instrument_queries(engine)
 
 AsyncSessionLocal = sessionmaker(
     engine,
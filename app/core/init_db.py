@@ -2,10 +2,12 @@ import contextlib
 
 from fastapi_users.exceptions import UserAlreadyExists
 from pydantic import EmailStr
+from sqlalchemy import exists, func, select
 
 from app.core.config import settings
-from app.core.db import get_async_session
+from app.core.db import AsyncSessionLocal, get_async_session
 from app.core.user import get_user_db, get_user_manager
+from app.models.user import User
 from app.schemas.user import UserCreate
 
 get_async_session_context = contextlib.asynccontextmanager(get_async_session)
@@ -35,11 +37,25 @@ async def create_user(
         pass
 
 
+async def user_exists(email: EmailStr) -> bool:
+    """Проверить, что пользователь с email уже есть."""
+    async with AsyncSessionLocal() as session:
+        return await session.scalar(
+            select(exists().where(
+                func.lower(User.email) == func.lower(email)
+            ))
+        )
+
+
 async def create_first_superuser():
-    """Создать первого суперпользователя."""
+    """
+    Создать первого суперпользователя.
+    Если он уже есть, пароль не хэшируется.
+    """
     if (
             settings.first_superuser_email is not None and
-            settings.first_superuser_password is not None
+            settings.first_superuser_password is not None and
+            not await user_exists(settings.first_superuser_email)
     ):
         await create_user(
             email=settings.first_superuser_email,
@@ -0,0 +1,64 @@
+from datetime import datetime
+from typing import List
+
+from app.core.config import configure_logger, settings
+from app.core.db import AsyncSessionLocal
+from app.core.scheduler import PeriodicJob
+from app.crud.stats import task_stats_crud
+from app.crud.task import task_crud
+
+logger = configure_logger(__name__)
+
+# Ключи advisory-блокировок фоновых задач.
+EXPIRY_SWEEP_LOCK_KEY = 7_342_001
+STATS_RECONCILE_LOCK_KEY = 7_342_002
+
+
+async def sweep_expired_tasks() -> None:
+    """Зафиксировать истечение срока у всех просроченных активных задач."""
+    now = datetime.now()
+    batch_size = settings.task_expiry_sweep_batch_size
+    total = 0
+    while True:
+        async with AsyncSessionLocal() as session:
+            expired_ids = await task_crud.mark_expired(
+                session=session,
+                now=now,
+                batch_size=batch_size,
+            )
+        total += len(expired_ids)
+        if len(expired_ids) < batch_size:
+            break
+    if total:
+        logger.info('Отмечено истёкших задач: %s', total)
+
+
+async def reconcile_task_stats() -> None:
+    """Исправить расхождения сводных счётчиков задач."""
+    async with AsyncSessionLocal() as session:
+        fixed = await task_stats_crud.reconcile(session=session)
+    if fixed:
+        logger.warning('Исправлено строк статистики задач: %s', fixed)
+
+
+def get_periodic_jobs() -> List[PeriodicJob]:
+    """Получить фоновые задачи, включённые в настройках."""
+    jobs = []
+    if settings.task_expiry_sweep_enabled:
+        jobs.append(PeriodicJob(
+            name='task-expiry-sweep',
+            interval=settings.task_expiry_sweep_interval,
+            lock_key=EXPIRY_SWEEP_LOCK_KEY,
+            job=sweep_expired_tasks,
+        ))
+    if settings.task_stats_reconcile_enabled:
+        # Сверка читает все задачи целиком, поэтому не запускается
+        # при каждом старте приложения.
+        jobs.append(PeriodicJob(
+            name='task-stats-reconcile',
+            interval=settings.task_stats_reconcile_interval,
+            lock_key=STATS_RECONCILE_LOCK_KEY,
+            job=reconcile_task_stats,
+            initial_delay=settings.task_stats_reconcile_interval,
+        ))
+    return jobs
@@ -0,0 +1,177 @@
+import atexit
+import logging
+import queue
+import sys
+import time
+import uuid
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional, TextIO, Tuple
+
+import orjson
+
+# Поля структурированной записи: request_id и user_id берутся
+# из контекста запроса, task_id и duration_ms передаются через extra.
+CONTEXT_FIELDS = ('request_id', 'user_id', 'task_id', 'duration_ms')
+REQUEST_ID_HEADER = 'x-request-id'
+
+log_context: ContextVar[Optional[dict]] = ContextVar(
+    'log_context',
+    default=None
+)
+
+
+def bind_log_context(**fields) -> None:
+    """Добавить поля в контекст логирования текущего запроса."""
+    context = log_context.get()
+    if context is None:
+        log_context.set(fields)
+    else:
+        context.update(fields)
+
+
+class ContextQueueHandler(QueueHandler):
+    """
+    Обработчик, передающий записи в очередь без форматирования.
+    Форматирование и вывод выполняет поток QueueListener, в цикле
+    событий к записи только добавляются поля контекста. Поэтому
+    аргументы сообщений должны быть неизменяемыми значениями.
+    При переполнении очереди записи отбрасываются, а не блокируют.
+    """
+
+    def __init__(self, log_queue: queue.Queue) -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        context = log_context.get() or {}
+        for field in CONTEXT_FIELDS:
+            if not hasattr(record, field):
+                setattr(record, field, context.get(field))
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class JsonFormatter(logging.Formatter):
+    """Форматирование записи в одну строку JSON."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for field in CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                payload[field] = value
+        if record.exc_info:
+            payload['exc'] = self.formatException(record.exc_info)
+        return orjson.dumps(payload, default=str).decode()
+
+
+def build_pipeline(
+    formatter: logging.Formatter,
+    queue_size: int,
+    stream: Optional[TextIO] = None,
+) -> Tuple[ContextQueueHandler, QueueListener]:
+    """Собрать обработчик-очередь и слушатель, пишущий в поток."""
+    log_queue = queue.Queue(maxsize=queue_size)
+    stream_handler = logging.StreamHandler(stream or sys.stderr)
+    stream_handler.setFormatter(formatter)
+    listener = QueueListener(
+        log_queue,
+        stream_handler,
+        respect_handler_level=True
+    )
+    return ContextQueueHandler(log_queue), listener
+
+
+_queue_handler: Optional[ContextQueueHandler] = None
+_listener: Optional[QueueListener] = None
+
+
+def setup_logging(
+    fmt: str,
+    json_output: bool,
+    queue_size: int,
+) -> ContextQueueHandler:
+    """
+    Запустить общий конвейер логирования процесса.
+    Повторные вызовы возвращают уже запущенный обработчик.
+    """
+    global _queue_handler, _listener
+    if _queue_handler is None:
+        formatter = JsonFormatter() if json_output else logging.Formatter(fmt)
+        _queue_handler, _listener = build_pipeline(formatter, queue_size)
+        _listener.start()
+        atexit.register(shutdown_logging)
+    return _queue_handler
+
+
+def shutdown_logging() -> None:
+    """Дописать оставшиеся записи и остановить поток вывода."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+class RequestContextMiddleware:
+    """
+    ASGI-посредник, назначающий запросу request_id для логов.
+    Идентификатор берётся из заголовка X-Request-ID или создаётся
+    и возвращается в ответе. Если передан логгер, по завершении
+    запроса в него пишется запись с длительностью запроса.
+    """
+
+    def __init__(
+        self,
+        app,
+        logger: Optional[logging.Logger] = None
+    ) -> None:
+        self.app = app
+        self.logger = logger
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope['headers']:
+            if name == REQUEST_ID_HEADER.encode():
+                request_id = value.decode('latin-1')[:128]
+                break
+        request_id = request_id or uuid.uuid4().hex
+        token = log_context.set({'request_id': request_id})
+        status = 500
+
+        async def send_wrapper(message) -> None:
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+                message['headers'] = [
+                    *message.get('headers', []),
+                    (REQUEST_ID_HEADER.encode(), request_id.encode('latin-1')),
+                ]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if self.logger is not None:
+                duration_ms = (time.perf_counter() - start) * 1000
+                self.logger.info(
+                    '%s %s - %s за %.1f мс',
+                    scope['method'], scope['path'], status, duration_ms,
+                    extra={'duration_ms': round(duration_ms, 3)}
+                )
+            log_context.reset(token)
@@ -0,0 +1,438 @@
+import asyncio
+import os
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import configure_logger
+
+logger = configure_logger(__name__)
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+SIZE_BUCKETS = (
+    256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304
+)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+
+# Маршрут запросов, не совпавших ни с одним путём приложения:
+# сырой путь в метке породил бы неограниченное число серий.
+UNMATCHED_ROUTE = 'unmatched'
+
+
+class Histogram:
+    """Гистограмма с фиксированными границами корзин."""
+
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Учесть наблюдение."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class HistogramFamily:
+    """Набор гистограмм одной метрики с разными значениями меток."""
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        label_names: Tuple[str, ...],
+        buckets: Sequence[float],
+    ) -> None:
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+        self.buckets = buckets
+        self.series: Dict[Tuple[str, ...], Histogram] = {}
+
+    def observe(self, labels: Tuple[str, ...], value: float) -> None:
+        """Учесть наблюдение в серии с заданными метками."""
+        histogram = self.series.get(labels)
+        if histogram is None:
+            histogram = self.series[labels] = Histogram(self.buckets)
+        histogram.observe(value)
+
+    def render(self, const_labels: Sequence[str] = ()) -> List[str]:
+        """Получить строки метрики в текстовом формате Prometheus."""
+        lines = [
+            f'# HELP {self.name} {self.description}',
+            f'# TYPE {self.name} histogram',
+        ]
+        for labels, histogram in list(self.series.items()):
+            pairs = [*const_labels] + [
+                f'{name}="{escape_label(value)}"'
+                for name, value in zip(self.label_names, labels)
+            ]
+            cumulative = 0
+            for bound, count in zip(
+                (*map(format_bound, histogram.buckets), '+Inf'),
+                histogram.counts
+            ):
+                cumulative += count
+                series = ','.join((*pairs, f'le="{bound}"'))
+                lines.append(f'{self.name}_bucket{{{series}}} {cumulative}')
+            series = ','.join(pairs)
+            lines.append(f'{self.name}_sum{{{series}}} {histogram.sum}')
+            lines.append(f'{self.name}_count{{{series}}} {histogram.count}')
+        return lines
+
+
+class Counter:
+    """Монотонный счётчик без меток."""
+
+    def __init__(self, name: str, description: str) -> None:
+        self.name = name
+        self.description = description
+        self.value = 0.0
+
+    def inc(self, amount: float = 1) -> None:
+        """Увеличить значение счётчика."""
+        self.value += amount
+
+    def render(self, const_labels: Sequence[str] = ()) -> List[str]:
+        """Получить строки метрики в текстовом формате Prometheus."""
+        return [
+            f'# HELP {self.name} {self.description}',
+            f'# TYPE {self.name} counter',
+            f'{self.name}{format_labels(const_labels)} {self.value}',
+        ]
+
+
+class Gauge:
+    """Текущее значение без меток, читаемое при отдаче метрик."""
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        read: Callable[[], float],
+    ) -> None:
+        self.name = name
+        self.description = description
+        self.read = read
+
+    def render(self, const_labels: Sequence[str] = ()) -> List[str]:
+        """Получить строки метрики в текстовом формате Prometheus."""
+        return [
+            f'# HELP {self.name} {self.description}',
+            f'# TYPE {self.name} gauge',
+            f'{self.name}{format_labels(const_labels)} {self.read()}',
+        ]
+
+
+def escape_label(value: str) -> str:
+    """Экранировать значение метки для текстового формата Prometheus."""
+    return (
+        value.replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+    )
+
+
+def format_labels(pairs: Sequence[str]) -> str:
+    """Записать готовые пары меток в фигурных скобках."""
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def format_bound(bound: float) -> str:
+    """Записать границу корзины без лишней дробной части."""
+    return str(int(bound)) if float(bound).is_integer() else str(bound)
+
+
+class RequestMetrics:
+    """Счётчики запросов к базе данных в рамках одного HTTP-запроса."""
+
+    __slots__ = ('statements', 'db_time')
+
+    def __init__(self) -> None:
+        self.statements = 0
+        self.db_time = 0.0
+
+
+class MetricsRegistry:
+    """
+    Метрики процесса.
+    Все обновления выполняются в одном цикле событий без блокировок.
+    Каждая серия помечается меткой pid воркера, а при нескольких
+    воркерах они обмениваются значениями через файлы в общем
+    каталоге - см. SharedMetrics.
+    """
+
+    def __init__(self) -> None:
+        labels = ('method', 'route')
+        self.request_duration = HistogramFamily(
+            'http_request_duration_seconds',
+            'Время обработки HTTP-запроса.',
+            (*labels, 'status'),
+            LATENCY_BUCKETS,
+        )
+        self.response_size = HistogramFamily(
+            'http_response_size_bytes',
+            'Размер тела HTTP-ответа.',
+            labels,
+            SIZE_BUCKETS,
+        )
+        self.request_statements = HistogramFamily(
+            'http_request_db_statements',
+            'Количество SQL-запросов на один HTTP-запрос.',
+            labels,
+            STATEMENT_BUCKETS,
+        )
+        self.request_db_time = HistogramFamily(
+            'http_request_db_duration_seconds',
+            'Суммарное время SQL-запросов на один HTTP-запрос.',
+            labels,
+            LATENCY_BUCKETS,
+        )
+        self.db_statements = Counter(
+            'db_statements_total',
+            'Всего выполнено SQL-запросов, включая фоновые задачи.',
+        )
+        self.db_time = Counter(
+            'db_statement_duration_seconds_total',
+            'Суммарное время выполнения SQL-запросов.',
+        )
+        self.extra: List = []
+
+    def register(self, metric) -> None:
+        """Добавить метрику другого модуля к отдаваемым."""
+        self.extra.append(metric)
+
+    def observe_request(
+        self,
+        method: str,
+        route: str,
+        status: int,
+        duration: float,
+        response_size: int,
+        request_metrics: RequestMetrics,
+    ) -> None:
+        """Учесть завершённый HTTP-запрос."""
+        labels = (method, route)
+        self.request_duration.observe((*labels, str(status)), duration)
+        self.response_size.observe(labels, response_size)
+        self.request_statements.observe(
+            labels,
+            request_metrics.statements
+        )
+        self.request_db_time.observe(labels, request_metrics.db_time)
+
+    def observe_statement(self, duration: float) -> None:
+        """Учесть выполненный SQL-запрос."""
+        self.db_statements.inc()
+        self.db_time.inc(duration)
+        request_metrics = current_request_metrics.get()
+        if request_metrics is not None:
+            request_metrics.statements += 1
+            request_metrics.db_time += duration
+
+    def render(self) -> str:
+        """Получить метрики воркера в текстовом формате Prometheus."""
+        const_labels = (f'pid="{os.getpid()}"',)
+        lines = []
+        for metric in (
+            self.request_duration,
+            self.response_size,
+            self.request_statements,
+            self.request_db_time,
+            self.db_statements,
+            self.db_time,
+            *self.extra,
+        ):
+            lines.extend(metric.render(const_labels))
+        lines.append('')
+        return '\n'.join(lines)
+
+
+def merge_expositions(texts: Iterable[str]) -> str:
+    """
+    Объединить метрики нескольких воркеров в один ответ.
+    Формат Prometheus требует, чтобы строки одной метрики шли
+    подряд под одним HELP и TYPE, поэтому серии группируются
+    по имени метрики. Серии воркеров различаются меткой pid.
+    """
+    families: Dict[str, List[str]] = {}
+    for text in texts:
+        family = None
+        for line in text.splitlines():
+            if line.startswith('# HELP '):
+                name = line.split(' ', 3)[2]
+                family = families.get(name)
+                if family is None:
+                    family = families[name] = [line]
+            elif line.startswith('# TYPE '):
+                if len(family) == 1:
+                    family.append(line)
+            elif line:
+                family.append(line)
+    lines = [line for family in families.values() for line in family]
+    lines.append('')
+    return '\n'.join(lines)
+
+
+class SharedMetrics:
+    """
+    Обмен метриками между воркерами через файлы.
+    Каждый воркер раз в interval записывает свои метрики в файл
+    <pid>.prom общего каталога, а запрос /metrics в любом воркере
+    отдаёт объединение всех свежих файлов. Файлы воркеров, не
+    обновлявшиеся дольше трёх интервалов, считаются брошенными
+    и удаляются.
+    """
+
+    def __init__(self, registry: MetricsRegistry) -> None:
+        self.registry = registry
+        self.directory: Optional[str] = None
+        self.interval = 5.0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.directory, f'{os.getpid()}.prom')
+
+    def write(self) -> str:
+        """Записать метрики воркера в его файл и вернуть их."""
+        text = self.registry.render()
+        temporary = f'{self.path}.tmp'
+        with open(temporary, 'w') as file:
+            file.write(text)
+        os.replace(temporary, self.path)
+        return text
+
+    def collect(self) -> str:
+        """Получить объединённые метрики всех воркеров."""
+        if self.directory is None:
+            return self.registry.render()
+        texts = [self.write()]
+        expired = time.time() - 3 * self.interval
+        for name in sorted(os.listdir(self.directory)):
+            path = os.path.join(self.directory, name)
+            if not name.endswith('.prom') or path == self.path:
+                continue
+            try:
+                if os.path.getmtime(path) < expired:
+                    os.remove(path)
+                    continue
+                with open(path) as file:
+                    texts.append(file.read())
+            except FileNotFoundError:
+                continue
+        return merge_expositions(texts)
+
+    async def _flush_forever(self) -> None:
+        while True:
+            try:
+                self.write()
+            except OSError as e:
+                logger.error('Ошибка записи метрик воркера - %s', e)
+            await asyncio.sleep(self.interval)
+
+    def start(self, directory: str, interval: float) -> None:
+        """Начать публиковать метрики воркера в каталоге directory."""
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.interval = interval
+        if self._task is None:
+            self._task = asyncio.create_task(
+                self._flush_forever(),
+                name='metrics-flush'
+            )
+
+    async def stop(self) -> None:
+        """Остановить публикацию и удалить файл воркера."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+current_request_metrics: ContextVar[Optional[RequestMetrics]] = ContextVar(
+    'current_request_metrics',
+    default=None
+)
+metrics = MetricsRegistry()
+shared_metrics = SharedMetrics(metrics)
+
+
+class MetricsMiddleware:
+    """
+    ASGI-посредник, замеряющий время обработки, статус и размер ответа.
+    Маршрут берётся из шаблона пути после маршрутизации,
+    а не из фактического пути, чтобы число серий было ограничено.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        request_metrics = RequestMetrics()
+        token = current_request_metrics.set(request_metrics)
+        status = 500
+        response_size = 0
+
+        async def send_wrapper(message) -> None:
+            nonlocal status, response_size
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            elif message['type'] == 'http.response.body':
+                response_size += len(message.get('body', b''))
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start
+            current_request_metrics.reset(token)
+            route = scope.get('route')
+            metrics.observe_request(
+                method=scope['method'],
+                route=getattr(route, 'path', UNMATCHED_ROUTE),
+                status=status,
+                duration=duration,
+                response_size=response_size,
+                request_metrics=request_metrics,
+            )
+
+
+def instrument_statements(engine: AsyncEngine) -> None:
+    """Подписать метрики SQL-запросов на события выполнения движка."""
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, 'before_cursor_execute')
+    def before_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        context._metrics_start = time.perf_counter()
+
+    @event.listens_for(sync_engine, 'after_cursor_execute')
+    def after_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        metrics.observe_statement(
+            time.perf_counter() - context._metrics_start
+        )
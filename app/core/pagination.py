@@ -0,0 +1,44 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Callable, Optional, Sequence, Tuple
+
+
+def encode_cursor(sort_value: datetime, obj_id: int) -> str:
+    """Закодировать ключ сортировки в непрозрачный курсор."""
+    payload = json.dumps(
+        [sort_value.isoformat(), obj_id],
+        separators=(',', ':')
+    ).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Раскодировать курсор в ключ сортировки.
+    При некорректном курсоре выбрасывается ValueError.
+    """
+    try:
+        payload = base64.urlsafe_b64decode(
+            cursor + '=' * (-len(cursor) % 4)
+        )
+        sort_value, obj_id = json.loads(payload)
+        return datetime.fromisoformat(sort_value), int(obj_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError('Некорректный курсор.') from e
+
+
+def make_page(
+    objs: Sequence[Any],
+    limit: int,
+    sort_key: Callable[[Any], datetime],
+) -> Tuple[Sequence[Any], Optional[str]]:
+    """
+    Отрезать страницу от выборки размером limit + 1
+    и вычислить курсор следующей страницы.
+    """
+    if len(objs) <= limit:
+        return objs, None
+    objs = objs[:limit]
+    last = objs[-1]
+    return objs, encode_cursor(sort_key(last), last.id)
@@ -0,0 +1,156 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Tuple, TypeVar
+
+from fastapi_users.password import PasswordHelper
+from pwdlib import PasswordHash
+from pwdlib.hashers.argon2 import Argon2Hasher
+from pwdlib.hashers.bcrypt import BcryptHasher
+
+from app.core.config import settings
+from app.core.metrics import (
+    LATENCY_BUCKETS, Counter, Gauge, HistogramFamily, metrics
+)
+
+T = TypeVar('T')
+
+
+class PasswordHasherBusy(Exception):
+    """Очередь на хэширование паролей переполнена."""
+
+
+class AsyncPasswordHelper(PasswordHelper):
+    """
+    Хэширование и проверка паролей в пуле потоков.
+    argon2 и bcrypt отпускают GIL, поэтому потоки выполняют их
+    параллельно, не останавливая цикл событий. Число одновременных
+    операций ограничено размером пула, длина очереди - max_pending.
+    Синхронные методы PasswordHelper остаются для прочих вызовов.
+    """
+
+    def __init__(
+        self,
+        password_hash: PasswordHash,
+        workers: int,
+        max_pending: int,
+    ) -> None:
+        super().__init__(password_hash)
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self.running = 0
+        self.rejected = Counter(
+            'password_hash_rejected_total',
+            'Операции с паролями, отклонённые из-за переполнения очереди.',
+        )
+        self.wait_time = HistogramFamily(
+            'password_hash_wait_seconds',
+            'Ожидание свободного потока хэширования паролей.',
+            ('operation',),
+            LATENCY_BUCKETS,
+        )
+        self.duration = HistogramFamily(
+            'password_hash_duration_seconds',
+            'Время хэширования или проверки пароля.',
+            ('operation',),
+            LATENCY_BUCKETS,
+        )
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def metrics(self) -> list:
+        """Получить метрики очереди хэширования."""
+        return [
+            Gauge(
+                'password_hash_queue_depth',
+                'Операции с паролями, ожидающие свободного потока.',
+                lambda: self.pending,
+            ),
+            Gauge(
+                'password_hash_running',
+                'Операции с паролями, выполняемые сейчас.',
+                lambda: self.running,
+            ),
+            self.rejected,
+            self.wait_time,
+            self.duration,
+        ]
+
+    async def _run(self, operation: str, func: Callable[..., T], *args) -> T:
+        if self.pending >= self.max_pending:
+            self.rejected.inc()
+            raise PasswordHasherBusy()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers,
+                thread_name_prefix='password-hash'
+            )
+            self._semaphore = asyncio.Semaphore(self.workers)
+
+        self.pending += 1
+        queued = time.perf_counter()
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.pending -= 1
+        started = time.perf_counter()
+        self.wait_time.observe((operation,), started - queued)
+        self.running += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, func, *args
+            )
+        finally:
+            self.running -= 1
+            self._semaphore.release()
+            self.duration.observe(
+                (operation,),
+                time.perf_counter() - started
+            )
+
+    async def hash_async(self, password: str) -> str:
+        """Получить хэш пароля, не блокируя цикл событий."""
+        return await self._run('hash', self.hash, password)
+
+    async def verify_and_update_async(
+        self,
+        plain_password: str,
+        hashed_password: str
+    ) -> Tuple[bool, Optional[str]]:
+        """
+        Проверить пароль, не блокируя цикл событий.
+        Если хэш создан с устаревшими параметрами или другим
+        алгоритмом, вторым значением возвращается новый хэш.
+        """
+        return await self._run(
+            'verify',
+            self.verify_and_update,
+            plain_password,
+            hashed_password
+        )
+
+    def shutdown(self) -> None:
+        """Остановить пул потоков хэширования."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._semaphore = None
+
+
+# Новые хэши создаются argon2 с параметрами из настроек. Хэши
+# с другими параметрами или bcrypt обновляются при входе пользователя.
+password_helper = AsyncPasswordHelper(
+    PasswordHash((
+        Argon2Hasher(
+            time_cost=settings.password_argon2_time_cost,
+            memory_cost=settings.password_argon2_memory_cost,
+            parallelism=settings.password_argon2_parallelism,
+        ),
+        BcryptHasher(),
+    )),
+    workers=settings.password_hash_workers,
+    max_pending=settings.password_hash_max_pending,
+)
+for metric in password_helper.metrics():
+    metrics.register(metric)
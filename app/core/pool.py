@@ -0,0 +1,100 @@
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+class PoolStats:
+    """Счётчики пула соединений, обновляемые событиями SQLAlchemy."""
+
+    def __init__(self) -> None:
+        self.connects = 0
+        self.closes = 0
+        self.invalidations = 0
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.checkout_wait_total = 0.0
+        self.checkout_wait_max = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        """Учесть время ожидания свободного соединения."""
+        self.checkout_wait_total += seconds
+        if seconds > self.checkout_wait_max:
+            self.checkout_wait_max = seconds
+
+    def snapshot(self, pool) -> dict:
+        """Получить текущее состояние пула и накопленные счётчики."""
+        return {
+            'size': pool.size(),
+            'checked_in': pool.checkedin(),
+            'checked_out': pool.checkedout(),
+            'overflow': max(pool.overflow(), 0),
+            'checkouts': self.checkouts,
+            'checkout_timeouts': self.checkout_timeouts,
+            'checkout_wait_avg_ms': (
+                self.checkout_wait_total / self.checkouts * 1000
+                if self.checkouts else 0.0
+            ),
+            'checkout_wait_max_ms': self.checkout_wait_max * 1000,
+            'connects': self.connects,
+            'closes': self.closes,
+            'invalidations': self.invalidations,
+        }
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """
+    Асинхронный пул соединений, замеряющий время ожидания соединения,
+    включая открытие нового соединения сверх pool_size.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def recreate(self) -> 'InstrumentedAsyncPool':
+        # При engine.dispose() пул пересоздаётся, счётчики сохраняются.
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.stats.checkout_timeouts += 1
+            raise
+        finally:
+            self.stats.record_wait(time.perf_counter() - start)
+
+
+def instrument_pool(engine: AsyncEngine) -> None:
+    """Подписать счётчики пула движка на события соединений."""
+    sync_engine = engine.sync_engine
+
+    def stats() -> PoolStats:
+        return sync_engine.pool.stats
+
+    @event.listens_for(sync_engine, 'connect')
+    def on_connect(dbapi_connection, connection_record):
+        stats().connects += 1
+
+    @event.listens_for(sync_engine, 'close')
+    def on_close(dbapi_connection, connection_record):
+        stats().closes += 1
+
+    @event.listens_for(sync_engine, 'invalidate')
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        stats().invalidations += 1
+
+    @event.listens_for(sync_engine, 'checkout')
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        stats().checkouts += 1
+
+
+def pool_snapshot(engine: AsyncEngine) -> dict:
+    """Получить статистику пула соединений движка."""
+    pool = engine.sync_engine.pool
+    return pool.stats.snapshot(pool)
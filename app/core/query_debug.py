@@ -0,0 +1,159 @@
+import random
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import configure_logger, settings
+
+logger = configure_logger(__name__)
+
+EXPLAINABLE = ('select', 'with', 'insert', 'update', 'delete')
+EXPLAIN_SAVEPOINT = 'query_debug_explain'
+STATEMENT_LOG_LENGTH = 500
+
+
+class QueryRecorder:
+    """Журнал SQL-запросов, выполненных в рамках одной операции."""
+
+    def __init__(self) -> None:
+        self.shapes: Counter = Counter()
+        self.count = 0
+        self.duration = 0.0
+
+    def record(self, statement: str, duration: float) -> None:
+        """
+        Учесть выполненный запрос.
+        Текст запроса содержит только плейсхолдеры параметров,
+        поэтому одинаковые по форме запросы совпадают.
+        """
+        self.shapes[statement] += 1
+        self.count += 1
+        self.duration += duration
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Получить запросы, повторённые не меньше threshold раз."""
+        return [
+            (statement, count)
+            for statement, count in self.shapes.most_common()
+            if count >= threshold
+        ]
+
+
+current_query_recorder: ContextVar[Optional[QueryRecorder]] = ContextVar(
+    'current_query_recorder',
+    default=None
+)
+
+
+def shorten(statement: str) -> str:
+    """Сократить текст запроса для записи в лог."""
+    statement = ' '.join(statement.split())
+    if len(statement) <= STATEMENT_LOG_LENGTH:
+        return statement
+    return statement[:STATEMENT_LOG_LENGTH] + '...'
+
+
+def explain(conn, statement: str, parameters) -> Optional[str]:
+    """
+    Получить план запроса без его выполнения.
+    EXPLAIN выполняется под точкой сохранения, чтобы его ошибка
+    не прервала транзакцию приложения.
+    """
+    if not statement.lstrip().lower().startswith(EXPLAINABLE):
+        return None
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute(f'SAVEPOINT {EXPLAIN_SAVEPOINT}')
+        try:
+            cursor.execute(f'EXPLAIN {statement}', parameters)
+            plan = '\n'.join(row[0] for row in cursor.fetchall())
+        except Exception:
+            cursor.execute(f'ROLLBACK TO SAVEPOINT {EXPLAIN_SAVEPOINT}')
+            raise
+        finally:
+            cursor.execute(f'RELEASE SAVEPOINT {EXPLAIN_SAVEPOINT}')
+        return plan
+    finally:
+        cursor.close()
+
+
+def instrument_queries(engine: AsyncEngine) -> None:
+    """
+    Подписать журнал запросов и поиск медленных запросов
+    на события выполнения движка.
+    """
+    sync_engine = engine.sync_engine
+    threshold = settings.slow_query_threshold_ms / 1000
+
+    @event.listens_for(sync_engine, 'before_cursor_execute')
+    def before_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        context._query_debug_start = time.perf_counter()
+
+    @event.listens_for(sync_engine, 'after_cursor_execute')
+    def after_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        duration = time.perf_counter() - context._query_debug_start
+        recorder = current_query_recorder.get()
+        if recorder is not None:
+            recorder.record(statement, duration)
+        if duration < threshold:
+            return
+
+        plan = None
+        # Серверный курсор ещё не дочитан, а executemany
+        # не даёт одного набора параметров для плана.
+        if (
+            settings.slow_query_explain
+            and not executemany
+            and not context.is_server_side
+        ):
+            try:
+                plan = explain(conn, statement, parameters)
+            except Exception as e:
+                logger.warning('Не удалось получить план запроса - %s', e)
+        logger.warning(
+            'Медленный запрос %.1f мс: %s%s',
+            duration * 1000, shorten(statement),
+            f'\n{plan}' if plan else ''
+        )
+
+
+class QueryDebugMiddleware:
+    """
+    ASGI-посредник, считающий SQL-запросы HTTP-запроса
+    и сообщающий о повторяющихся запросах одной формы (N+1).
+    Доля проверяемых запросов задаётся query_debug_sample_rate.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if (
+            scope['type'] != 'http'
+            or random.random() >= settings.query_debug_sample_rate
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        recorder = QueryRecorder()
+        token = current_query_recorder.set(recorder)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_query_recorder.reset(token)
+            route = getattr(scope.get('route'), 'path', scope['path'])
+            for statement, count in recorder.repeated(
+                settings.n_plus_one_threshold
+            ):
+                logger.warning(
+                    'Возможный N+1 в %s %s: %s одинаковых запросов: %s',
+                    scope['method'], route, count, shorten(statement)
+                )
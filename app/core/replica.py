@@ -0,0 +1,153 @@
+import asyncio
+import itertools
+import time
+from typing import List
+
+from fastapi import Depends, Request, Response
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.cache import TTLCache
+from app.core.config import configure_logger, settings
+from app.core.db import AsyncSessionLocal, engine_options
+from app.core.metrics import instrument_statements
+from app.core.pool import instrument_pool
+from app.core.query_debug import instrument_queries
+from app.core.user import current_user
+from app.models.user import User
+
+logger = configure_logger(__name__)
+
+# Cookie со временем, до которого чтение идёт с основной базы.
+# Воркеров несколько, и следующий запрос пользователя обычно
+# попадает в другой процесс, поэтому отметка хранится у клиента.
+READ_YOUR_WRITES_COOKIE = 'read_primary_until'
+
+
+class Replica:
+    """Реплика базы данных со своим пулом соединений."""
+
+    def __init__(self, database_url: str) -> None:
+        self.name = make_url(database_url).render_as_string(
+            hide_password=True
+        )
+        options = engine_options(database_url)
+        options['pool_pre_ping'] = True
+        if make_url(database_url).get_driver_name() == 'asyncpg':
+            options['connect_args']['timeout'] = (
+                settings.database_replica_connect_timeout
+            )
+        self.engine = create_async_engine(database_url, **options)
+        instrument_pool(self.engine)
+        if settings.metrics_enabled:
+            instrument_statements(self.engine)
+        if settings.query_debug_enabled:
+            instrument_queries(self.engine)
+        self.sessionmaker = sessionmaker(
+            self.engine,
+            class_=AsyncSession,
+            expire_on_commit=False,
+        )
+        self.down_until = 0.0
+
+    @property
+    def healthy(self) -> bool:
+        """Реплика не отключена после недавней ошибки соединения."""
+        return time.monotonic() >= self.down_until
+
+    def mark_down(self) -> None:
+        """Исключить реплику из балансировки на время retry_interval."""
+        self.down_until = (
+            time.monotonic() + settings.database_replica_retry_interval
+        )
+
+
+class ReplicaRouter:
+    """
+    Балансировщик чтения по репликам.
+    Пользователь, недавно изменявший данные, читает с основной базы:
+    отметка о записи хранится в cookie и в памяти воркера - для
+    клиентов, которые не возвращают cookie.
+    """
+
+    def __init__(self, database_urls: List[str]) -> None:
+        self.replicas = [Replica(url) for url in database_urls]
+        self._offsets = itertools.cycle(range(len(self.replicas) or 1))
+        self._recent_writers = TTLCache(
+            maxsize=settings.read_your_writes_cache_size,
+            ttl=settings.read_your_writes_window
+        )
+
+    def candidates(self) -> List[Replica]:
+        """Получить доступные реплики в порядке round-robin."""
+        if not self.replicas:
+            return []
+        offset = next(self._offsets)
+        ordered = self.replicas[offset:] + self.replicas[:offset]
+        return [replica for replica in ordered if replica.healthy]
+
+    def pin_to_primary(self, user_id: int, response: Response) -> None:
+        """Направлять чтение пользователя на основную базу после записи."""
+        if not self.replicas:
+            return
+        window = settings.read_your_writes_window
+        self._recent_writers.set(user_id, True)
+        response.set_cookie(
+            READ_YOUR_WRITES_COOKIE,
+            str(int(time.time() + window)),
+            max_age=window,
+            httponly=True,
+            samesite='lax',
+        )
+
+    def is_pinned(self, user_id: int, request: Request) -> bool:
+        """Проверить, что пользователь недавно изменял данные."""
+        if self._recent_writers.get(user_id, False):
+            return True
+        try:
+            until = int(request.cookies.get(READ_YOUR_WRITES_COOKIE, 0))
+        except ValueError:
+            return False
+        # Отметка из будущего дальше окна не продлевает закрепление.
+        now = time.time()
+        return now < until <= now + settings.read_your_writes_window + 1
+
+    async def dispose(self) -> None:
+        """Закрыть пулы соединений реплик."""
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+
+replica_router = ReplicaRouter(settings.database_replica_urls)
+
+
+async def get_read_session(
+    request: Request,
+    user: User = Depends(current_user),
+) -> AsyncSession:
+    """
+    Получить асинхронную сессию для чтения.
+    Сессия открывается на реплике; если реплики не настроены,
+    недоступны или пользователь только что изменял данные -
+    на основной базе.
+    """
+    if not replica_router.is_pinned(user.id, request):
+        for replica in replica_router.candidates():
+            session = replica.sessionmaker()
+            try:
+                await session.connection()
+            except (DBAPIError, OSError, asyncio.TimeoutError) as e:
+                await session.close()
+                replica.mark_down()
+                logger.warning(
+                    'Реплика %s недоступна - %s', replica.name, e
+                )
+                continue
+            async with session:
+                yield session
+            return
+
+    async with AsyncSessionLocal() as async_session:
+        yield async_session
@@ -0,0 +1,95 @@
+import asyncio
+from typing import Awaitable, Callable, Optional
+
+from sqlalchemy import func, select
+
+from app.core.config import configure_logger
+from app.core.db import engine
+
+logger = configure_logger(__name__)
+
+
+class PeriodicJob:
+    """
+    Периодическая фоновая задача в цикле событий приложения.
+    Перед запуском берётся advisory-блокировка PostgreSQL, поэтому
+    из всех воркеров задачу одновременно выполняет только один.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        interval: float,
+        lock_key: int,
+        job: Callable[[], Awaitable[None]],
+        initial_delay: float = 0,
+    ) -> None:
+        self.name = name
+        self.interval = interval
+        self.lock_key = lock_key
+        self.job = job
+        self.initial_delay = initial_delay
+        self._task: Optional[asyncio.Task] = None
+
+    async def run_once(self) -> bool:
+        """
+        Выполнить задачу, если блокировка свободна.
+        Блокировка держится на отдельном соединении в режиме
+        AUTOCOMMIT, чтобы оно не простаивало в открытой транзакции,
+        и снимается сразу после выполнения.
+        """
+        async with engine.connect() as lock_connection:
+            await lock_connection.execution_options(
+                isolation_level='AUTOCOMMIT'
+            )
+            locked = await lock_connection.scalar(
+                select(func.pg_try_advisory_lock(self.lock_key))
+            )
+            if not locked:
+                return False
+            try:
+                await self.job()
+                released = await lock_connection.scalar(
+                    select(func.pg_advisory_unlock(self.lock_key))
+                )
+            except BaseException:
+                # Сессионная блокировка не снимается откатом: соединение
+                # закрывается, а не возвращается в пул с блокировкой.
+                await lock_connection.invalidate()
+                raise
+        if not released:
+            logger.warning(
+                'Блокировка задачи %s была потеряна до её завершения',
+                self.name
+            )
+        return True
+
+    async def _run_forever(self) -> None:
+        await asyncio.sleep(self.initial_delay)
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error('Ошибка фоновой задачи %s - %s', self.name, e)
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Запустить задачу в фоне."""
+        if self._task is None:
+            self._task = asyncio.create_task(
+                self._run_forever(),
+                name=self.name
+            )
+
+    async def stop(self) -> None:
+        """Остановить задачу, дождавшись её завершения."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
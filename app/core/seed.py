@@ -0,0 +1,295 @@
+"""
+Наполнение базы данных синтетическими пользователями и задачами.
+
+Строки загружаются через COPY (asyncpg copy_records_to_table) пачками,
+пароль хэшируется один раз для всех пользователей. Распределение
+создателей, ответственных и наблюдателей перекошено по закону Ципфа:
+немногие пользователи участвуют в большинстве задач. При одинаковом
+--seed и пустой базе данных получаются одинаковые данные.
+
+Запуск из корня проекта:
+    python -m app.core.seed --users 20000 --tasks 1000000
+"""
+import argparse
+import asyncio
+import itertools
+import random
+import time
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import asyncpg
+from sqlalchemy.engine import make_url
+
+from app.core.config import configure_logger, settings
+from app.core.password import password_helper
+
+logger = configure_logger(__name__)
+
+SEEDED_TABLES = (
+    'user',
+    'task',
+    'task_responsibles_reference',
+    'task_auditors_reference',
+)
+USER_COLUMNS = (
+    'id', 'email', 'hashed_password', 'is_active', 'is_superuser',
+    'is_verified',
+)
+TASK_COLUMNS = (
+    'id', 'title', 'description', 'is_active', 'creator_id',
+    'create_date', 'update_date', 'close_date', 'expiration_date',
+    'expired_at',
+)
+REFERENCE_COLUMNS = ('task_id', 'user_id')
+TITLE_WORDS = (
+    'отчёт', 'релиз', 'встреча', 'договор', 'аудит', 'миграция', 'счёт',
+    'звонок', 'презентация', 'проверка', 'бюджет', 'клиент', 'поставка',
+    'интеграция', 'обучение', 'исследование', 'ремонт', 'закупка',
+)
+
+
+class SkewedChooser:
+    """Выбор элементов с вероятностью, убывающей по закону Ципфа."""
+
+    def __init__(
+        self,
+        items: Sequence[int],
+        exponent: float,
+        rng: random.Random,
+    ) -> None:
+        self.items = list(items)
+        # Перемешивание отвязывает популярность пользователя от его id.
+        rng.shuffle(self.items)
+        self.rng = rng
+        self.cum_weights = list(itertools.accumulate(
+            1 / (rank ** exponent) for rank in range(1, len(items) + 1)
+        ))
+        self.total = self.cum_weights[-1]
+
+    def choice(self) -> int:
+        """Выбрать один элемент."""
+        return self.items[
+            bisect_left(self.cum_weights, self.rng.random() * self.total)
+        ]
+
+    def sample(self, count: int) -> List[int]:
+        """Выбрать до count различных элементов."""
+        return list(dict.fromkeys(self.choice() for _ in range(count)))
+
+
+def fan_out(
+    rng: random.Random,
+    mean: float,
+    minimum: int,
+    maximum: int,
+) -> int:
+    """Получить число участников задачи с экспоненциальным хвостом."""
+    extra = mean - minimum
+    count = minimum + (int(rng.expovariate(1 / extra)) if extra > 0 else 0)
+    return min(count, maximum)
+
+
+def make_users(
+    first_id: int,
+    count: int,
+    hashed_password: str,
+    email_prefix: str,
+) -> Iterator[Tuple]:
+    """Сгенерировать строки пользователей."""
+    for user_id in range(first_id, first_id + count):
+        yield (
+            user_id,
+            f'{email_prefix}{user_id}@seed.example.com',
+            hashed_password,
+            True,
+            False,
+            True,
+        )
+
+
+def make_task(
+    task_id: int,
+    rng: random.Random,
+    creators: SkewedChooser,
+    now: datetime,
+    args: argparse.Namespace,
+) -> Tuple:
+    """Сгенерировать строку задачи."""
+    create_date = now - timedelta(seconds=rng.uniform(0, args.days * 86400))
+    update_date = create_date + (now - create_date) * rng.random() ** 3
+    is_active = rng.random() >= args.closed_share
+    expiration_date = None
+    if rng.random() < args.deadline_share:
+        expiration_date = create_date + timedelta(days=rng.uniform(1, 60))
+    expired_at = None
+    if is_active and expiration_date is not None and expiration_date < now:
+        expired_at = expiration_date
+    return (
+        task_id,
+        ' '.join(rng.sample(TITLE_WORDS, rng.randint(2, 4))).capitalize(),
+        f'Синтетическая задача {task_id}',
+        is_active,
+        creators.choice(),
+        create_date,
+        update_date,
+        None if is_active else update_date,
+        expiration_date,
+        expired_at,
+    )
+
+
+def make_task_batches(
+    first_id: int,
+    user_ids: range,
+    args: argparse.Namespace,
+) -> Iterator[Tuple[List[Tuple], List[Tuple], List[Tuple]]]:
+    """Сгенерировать пачки строк задач, ответственных и наблюдателей."""
+    rng = random.Random(args.seed)
+    creators = SkewedChooser(user_ids, args.skew, rng)
+    members = SkewedChooser(user_ids, args.skew, rng)
+    now = datetime.now().replace(microsecond=0)
+    task_ids = range(first_id, first_id + args.tasks)
+    for start in range(0, len(task_ids), args.batch_size):
+        tasks, responsibles, auditors = [], [], []
+        for task_id in task_ids[start:start + args.batch_size]:
+            tasks.append(make_task(task_id, rng, creators, now, args))
+            responsibles.extend(
+                (task_id, user_id) for user_id in members.sample(fan_out(
+                    rng, args.responsibles_mean, 1, args.responsibles_max
+                ))
+            )
+            auditors.extend(
+                (task_id, user_id) for user_id in members.sample(fan_out(
+                    rng, args.auditors_mean, 0, args.auditors_max
+                ))
+            )
+        yield tasks, responsibles, auditors
+
+
+def batched(rows: Iterator[Tuple], size: int) -> Iterator[List[Tuple]]:
+    """Разбить строки на пачки."""
+    while batch := list(itertools.islice(rows, size)):
+        yield batch
+
+
+async def next_id(connection: asyncpg.Connection, table: str) -> int:
+    """Получить первый свободный id таблицы."""
+    return await connection.fetchval(
+        f'SELECT coalesce(max(id), 0) + 1 FROM "{table}"'
+    )
+
+
+async def sync_sequence(connection: asyncpg.Connection, table: str) -> None:
+    """Сдвинуть последовательность id за загруженные строки."""
+    await connection.execute(
+        f"SELECT setval(pg_get_serial_sequence('\"{table}\"', 'id'), "
+        f'(SELECT coalesce(max(id), 1) FROM "{table}"))'
+    )
+
+
+async def load(
+    connection: asyncpg.Connection,
+    args: argparse.Namespace
+) -> None:
+    """
+    Загрузить пользователей, задачи и связи в открытой транзакции
+    соединения. Фиксирует или откатывает её вызывающий код.
+    """
+    hashed_password = password_helper.hash(args.password)
+    # Id назначаются здесь, поэтому параллельная запись
+    # в эти таблицы на время загрузки запрещена.
+    await connection.execute(
+        'LOCK TABLE ' + ', '.join(f'"{t}"' for t in SEEDED_TABLES)
+        + ' IN EXCLUSIVE MODE'
+    )
+    first_user_id = await next_id(connection, 'user')
+    first_task_id = await next_id(connection, 'task')
+
+    start = time.perf_counter()
+    for batch in batched(
+        make_users(
+            first_user_id, args.users, hashed_password,
+            args.email_prefix
+        ),
+        args.batch_size
+    ):
+        await connection.copy_records_to_table(
+            'user', records=batch, columns=USER_COLUMNS
+        )
+    logger.info(
+        'Загружено пользователей: %s за %.1f с',
+        args.users, time.perf_counter() - start
+    )
+
+    start = time.perf_counter()
+    loaded = 0
+    user_ids = range(first_user_id, first_user_id + args.users)
+    for tasks, responsibles, auditors in make_task_batches(
+        first_task_id, user_ids, args
+    ):
+        for table, records, columns in (
+            ('task', tasks, TASK_COLUMNS),
+            ('task_responsibles_reference', responsibles,
+             REFERENCE_COLUMNS),
+            ('task_auditors_reference', auditors,
+             REFERENCE_COLUMNS),
+        ):
+            if records:
+                await connection.copy_records_to_table(
+                    table, records=records, columns=columns
+                )
+        loaded += len(tasks)
+        logger.info(
+            'Загружено задач: %s из %s за %.1f с',
+            loaded, args.tasks, time.perf_counter() - start
+        )
+
+    for table in ('user', 'task'):
+        await sync_sequence(connection, table)
+
+
+async def seed(args: argparse.Namespace) -> None:
+    """Загрузить пользователей, задачи и связи одной транзакцией."""
+    url = make_url(settings.database_url).set(drivername='postgresql')
+    connection = await asyncpg.connect(
+        url.render_as_string(hide_password=False)
+    )
+    try:
+        async with connection.transaction():
+            await load(connection, args)
+
+        for table in SEEDED_TABLES:
+            await connection.execute(f'ANALYZE "{table}"')
+    finally:
+        await connection.close()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--users', type=int, default=10000)
+    parser.add_argument('--tasks', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--batch-size', type=int, default=50000)
+    parser.add_argument(
+        '--skew', type=float, default=1.1,
+        help='Показатель распределения Ципфа для выбора пользователей'
+    )
+    parser.add_argument('--responsibles-mean', type=float, default=2.0)
+    parser.add_argument('--responsibles-max', type=int, default=20)
+    parser.add_argument('--auditors-mean', type=float, default=1.0)
+    parser.add_argument('--auditors-max', type=int, default=10)
+    parser.add_argument('--closed-share', type=float, default=0.3)
+    parser.add_argument('--deadline-share', type=float, default=0.6)
+    parser.add_argument(
+        '--days', type=int, default=365,
+        help='Глубина истории задач в днях'
+    )
+    parser.add_argument('--email-prefix', default='seed-user-')
+    parser.add_argument('--password', default='seed-password')
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    asyncio.run(seed(parse_args()))
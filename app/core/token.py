@@ -0,0 +1,91 @@
+import hashlib
+import time
+from typing import Any, Optional, Tuple
+
+import jwt
+from fastapi_users import exceptions
+from fastapi_users.authentication import JWTStrategy
+from fastapi_users.jwt import decode_jwt
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+SYMMETRIC_ALGORITHMS = ('HS256', 'HS384', 'HS512')
+
+
+def read_key(path: Optional[str], name: str) -> str:
+    """Прочитать PEM-ключ из файла, указанного в настройках."""
+    if not path:
+        raise ValueError(
+            f'Для алгоритма {settings.jwt_algorithm} нужен {name}.'
+        )
+    with open(path) as file:
+        return file.read()
+
+
+def signing_keys() -> Tuple[str, Optional[str]]:
+    """
+    Получить ключ подписи и ключ проверки токенов.
+    Для HS* оба ключа - общий секрет, для ES256 и EdDSA -
+    закрытый и открытый ключи из PEM-файлов.
+    """
+    if settings.jwt_algorithm in SYMMETRIC_ALGORITHMS:
+        return settings.jwt_secret, None
+    return (
+        read_key(settings.jwt_private_key_path, 'jwt_private_key_path'),
+        read_key(settings.jwt_public_key_path, 'jwt_public_key_path'),
+    )
+
+
+class CachedJWTStrategy(JWTStrategy):
+    """
+    Стратегия JWT с кэшем проверенных токенов.
+    По хэшу токена хранится id пользователя до истечения токена,
+    поэтому подпись и claims проверяются один раз на токен,
+    а не на каждый запрос. Недействительные токены не кэшируются.
+    """
+
+    def __init__(self, *args, cache_size: int, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.verified = TTLCache(
+            maxsize=cache_size,
+            ttl=self.lifetime_seconds or settings.token_lifetime
+        )
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        """Получить ключ кэша, не храня сам токен."""
+        return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+    def verify(self, token: str, user_manager) -> Optional[Any]:
+        """Проверить токен и закэшировать id пользователя."""
+        try:
+            data = decode_jwt(
+                token,
+                self.decode_key,
+                self.token_audience,
+                algorithms=[self.algorithm]
+            )
+            user_id = user_manager.parse_id(data['sub'])
+        except (jwt.PyJWTError, KeyError, exceptions.InvalidID):
+            return None
+        expires_at = data.get('exp')
+        self.verified.set(
+            self.digest(token),
+            user_id,
+            ttl=None if expires_at is None else expires_at - time.time()
+        )
+        return user_id
+
+    async def read_token(self, token: Optional[str], user_manager):
+        if token is None:
+            return None
+        user_id = self.verified.get(self.digest(token))
+        if user_id is None:
+            user_id = self.verify(token, user_manager)
+            if user_id is None:
+                return None
+        try:
+            return await user_manager.get(user_id)
+        except exceptions.UserNotExists:
+            return None
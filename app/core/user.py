@@ -1,17 +1,28 @@
-from typing import Optional, Union
+from typing import Any, Dict, Optional, Union
 
-from fastapi import Depends, Request
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import OAuth2PasswordRequestForm
 from fastapi_users import (
-    BaseUserManager, FastAPIUsers, IntegerIDMixin, InvalidPasswordException
+    BaseUserManager,
+    FastAPIUsers,
+    IntegerIDMixin,
+    InvalidPasswordException,
+    exceptions
 )
 from fastapi_users.authentication import (
     AuthenticationBackend, BearerTransport, JWTStrategy
 )
 from fastapi_users_db_sqlalchemy import SQLAlchemyUserDatabase
+from sqlalchemy import inspect
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 
 from app.core.config import configure_logger, settings
 from app.core.db import get_async_session
+from app.core.log import bind_log_context
+from app.core.password import PasswordHasherBusy, password_helper
+from app.core.token import CachedJWTStrategy, signing_keys
+from app.core.user_cache import user_cache
 from app.models.user import User
 from app.schemas.user import UserCreate
 
@@ -33,12 +44,19 @@ bearer_transport = BearerTransport(
 )
 
 
+secret, public_key = signing_keys()
+jwt_strategy = CachedJWTStrategy(
+    secret=secret,
+    public_key=public_key,
+    algorithm=settings.jwt_algorithm,
+    lifetime_seconds=settings.token_lifetime,
+    cache_size=settings.token_cache_size,
+)
+
+
 def get_jwt_strategy() -> JWTStrategy:
-    """Настроить работу с JWT-токенами."""
-    return JWTStrategy(
-        secret=settings.jwt_secret,
-        lifetime_seconds=settings.token_lifetime
-    )
+    """Получить общую для всех запросов стратегию JWT."""
+    return jwt_strategy
 
 
 auth_backend = AuthenticationBackend(
@@ -48,9 +66,124 @@ auth_backend = AuthenticationBackend(
 )
 
 
+def hasher_busy_error() -> HTTPException:
+    """Получить ошибку 503 при переполненной очереди хэширования."""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail='Сервис перегружен, повторите попытку позже.',
+        headers={'Retry-After': '1'}
+    )
+
+
 class UserManager(IntegerIDMixin, BaseUserManager[User, int]):
     """Класс для настройки аутентификации пользователей."""
 
+    async def get(self, id: int) -> User:
+        """
+        Получить пользователя по id.
+        Закэшированная строка присоединяется к текущей сессии
+        через merge без обращения к базе данных.
+        """
+        values = user_cache.get(id)
+        if values is None:
+            generation = user_cache.generation
+            user = await super().get(id)
+            user_cache.set(id, self._user_values(user), generation)
+            return user
+
+        user = User(**values)
+        make_transient_to_detached(user)
+        return await self.user_db.session.merge(user, load=False)
+
+    async def _hash(self, password: str) -> str:
+        try:
+            return await self.password_helper.hash_async(password)
+        except PasswordHasherBusy:
+            raise hasher_busy_error()
+
+    async def create(
+        self,
+        user_create: UserCreate,
+        safe: bool = False,
+        request: Optional[Request] = None,
+    ) -> User:
+        """Создать пользователя, хэшируя пароль вне цикла событий."""
+        await self.validate_password(user_create.password, user_create)
+
+        existing_user = await self.user_db.get_by_email(user_create.email)
+        if existing_user is not None:
+            raise exceptions.UserAlreadyExists()
+
+        user_dict = (
+            user_create.create_update_dict()
+            if safe
+            else user_create.create_update_dict_superuser()
+        )
+        user_dict['hashed_password'] = await self._hash(
+            user_dict.pop('password')
+        )
+        created_user = await self.user_db.create(user_dict)
+        await self.on_after_register(created_user, request)
+        return created_user
+
+    async def authenticate(
+        self,
+        credentials: OAuth2PasswordRequestForm
+    ) -> Optional[User]:
+        """
+        Проверить email и пароль, не блокируя цикл событий.
+        Хэш с устаревшими параметрами заменяется новым.
+        """
+        try:
+            user = await self.get_by_email(credentials.username)
+        except exceptions.UserNotExists:
+            # Хэширование выравнивает время ответа для неизвестного email.
+            await self._hash(credentials.password)
+            return None
+
+        try:
+            verified, updated_password_hash = (
+                await self.password_helper.verify_and_update_async(
+                    credentials.password,
+                    user.hashed_password
+                )
+            )
+        except PasswordHasherBusy:
+            raise hasher_busy_error()
+        if not verified:
+            return None
+        if updated_password_hash is not None:
+            await self.user_db.update(
+                user,
+                {'hashed_password': updated_password_hash}
+            )
+            await user_cache.invalidate(self.user_db.session, user.id)
+        return user
+
+    async def _update(
+        self,
+        user: User,
+        update_dict: Dict[str, Any]
+    ) -> User:
+        """Изменить пользователя, хэшируя новый пароль вне цикла событий."""
+        password = update_dict.get('password')
+        if password is not None:
+            await self.validate_password(password, user)
+            update_dict = {
+                key: value for key, value in update_dict.items()
+                if key != 'password'
+            }
+            update_dict['hashed_password'] = await self._hash(password)
+        return await super()._update(user, update_dict)
+
+    @staticmethod
+    def _user_values(user: User) -> Dict[str, Any]:
+        """Получить значения колонок пользователя для кэша."""
+        return {
+            attr.key: getattr(user, attr.key)
+            for attr in inspect(User).column_attrs
+        }
+
     async def validate_password(
         self,
         password: str,
@@ -74,9 +207,43 @@ class UserManager(IntegerIDMixin, BaseUserManager[User, int]):
         request: Optional[Request] = None
     ):
         """Записать в логгере успешную регистрацию."""
-        logger.info(
-            f'Пользователь {user.email} зарегистрирован.'
-        )
+        logger.info('Пользователь %s зарегистрирован.', user.email)
+
+    async def on_after_update(
+        self,
+        user: User,
+        update_dict: Dict[str, Any],
+        request: Optional[Request] = None,
+    ):
+        """
+        Сбросить кэш всех воркеров после изменения
+        или деактивации пользователя.
+        """
+        await user_cache.invalidate(self.user_db.session, user.id)
+
+    async def on_after_verify(
+        self,
+        user: User,
+        request: Optional[Request] = None
+    ):
+        """Сбросить кэш после верификации пользователя."""
+        await user_cache.invalidate(self.user_db.session, user.id)
+
+    async def on_after_reset_password(
+        self,
+        user: User,
+        request: Optional[Request] = None
+    ):
+        """Сбросить кэш после сброса пароля."""
+        await user_cache.invalidate(self.user_db.session, user.id)
+
+    async def on_after_delete(
+        self,
+        user: User,
+        request: Optional[Request] = None
+    ):
+        """Сбросить кэш после удаления пользователя."""
+        await user_cache.invalidate(self.user_db.session, user.id)
 
 
 async def get_user_manager(
@@ -85,7 +252,7 @@ async def get_user_manager(
     )
 ):
     """Получить объъект UserManager."""
-    yield UserManager(user_db)
+    yield UserManager(user_db, password_helper)
 
 
 fastapi_users = FastAPIUsers[User, int](
@@ -93,6 +260,20 @@ fastapi_users = FastAPIUsers[User, int](
     [auth_backend]
 )
 
-current_user = fastapi_users.current_user(active=True)
-current_superuser = fastapi_users.current_user(active=True,
-                                               superuser=True)
+current_active_user = fastapi_users.current_user(active=True)
+current_active_superuser = fastapi_users.current_user(active=True,
+                                                      superuser=True)
+
+
+async def current_user(user: User = Depends(current_active_user)) -> User:
+    """Получить текущего пользователя и добавить его id в логи."""
+    bind_log_context(user_id=user.id)
+    return user
+
+
+async def current_superuser(
+    user: User = Depends(current_active_superuser)
+) -> User:
+    """Получить текущего суперпользователя и добавить его id в логи."""
+    bind_log_context(user_id=user.id)
+    return user
@@ -0,0 +1,171 @@
+import asyncio
+from contextlib import suppress
+from typing import Any, Dict, Optional
+
+import asyncpg
+from sqlalchemy import func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import configure_logger, settings
+
+logger = configure_logger(__name__)
+
+# Канал PostgreSQL, в который публикуются id изменённых пользователей.
+USER_CACHE_CHANNEL = 'user_cache_invalidate'
+
+
+class SharedUserCache:
+    """
+    Кэш строк пользователей, согласованный между воркерами.
+    Изменение пользователя публикуется через NOTIFY после коммита,
+    и каждый воркер удаляет запись из своего кэша. Пока соединение
+    с LISTEN не установлено, кэш не используется: пропущенное
+    уведомление оставило бы отключённого пользователя активным.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        retry_interval: float,
+    ) -> None:
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.retry_interval = retry_interval
+        self.listening = False
+        # Растёт при каждом сбросе: строка, прочитанная до сброса,
+        # не попадает в кэш.
+        self.generation = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.cache.maxsize > 0 and self.cache.ttl > 0
+
+    def get(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """Получить значения колонок пользователя, если кэш согласован."""
+        if not self.listening:
+            return None
+        return self.cache.get(user_id)
+
+    def set(
+        self,
+        user_id: int,
+        values: Dict[str, Any],
+        generation: int
+    ) -> None:
+        """
+        Сохранить строку, прочитанную при данном поколении кэша.
+        Если за время чтения пришёл сброс, строка могла устареть.
+        """
+        if self.listening and generation == self.generation:
+            self.cache.set(user_id, values)
+
+    def drop(self, user_id: int) -> None:
+        """Удалить пользователя из кэша этого воркера."""
+        self.generation += 1
+        self.cache.pop(user_id)
+
+    def clear(self) -> None:
+        """Очистить кэш этого воркера."""
+        self.generation += 1
+        self.cache.clear()
+
+    async def invalidate(self, session: AsyncSession, user_id: int) -> None:
+        """
+        Сбросить пользователя в кэше всех воркеров.
+        Вызывается после коммита изменения: уведомление доставляется
+        только при коммите, поэтому воркеры перечитают новую строку.
+        """
+        self.drop(user_id)
+        if not self.enabled:
+            return
+        await session.execute(
+            select(func.pg_notify(USER_CACHE_CHANNEL, str(user_id)))
+        )
+        await session.commit()
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        try:
+            self.drop(int(payload))
+        except ValueError:
+            self.clear()
+
+    async def _listen(self, dsn: str) -> None:
+        connection = await asyncpg.connect(
+            dsn,
+            timeout=settings.database_pool_timeout
+        )
+        try:
+            await connection.add_listener(
+                USER_CACHE_CHANNEL,
+                self._on_notify
+            )
+            # Уведомления до LISTEN могли потеряться.
+            self.clear()
+            self.listening = True
+            logger.info('Кэш пользователей подписан на изменения')
+            while True:
+                await asyncio.sleep(self.retry_interval)
+                # Проверка замечает и полуоткрытое TCP-соединение.
+                await connection.fetchval(
+                    'SELECT 1',
+                    timeout=self.retry_interval
+                )
+        finally:
+            self.listening = False
+            self.clear()
+            with suppress(Exception):
+                await asyncio.shield(connection.close(timeout=1))
+
+    async def _listen_forever(self, dsn: str) -> None:
+        while True:
+            try:
+                await self._listen(dsn)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(
+                    'Кэш пользователей отключён, нет подписки '
+                    'на изменения - %s', e
+                )
+            await asyncio.sleep(self.retry_interval)
+
+    def start(self, database_url: str) -> None:
+        """
+        Подписаться на изменения пользователей в фоне.
+        LISTEN поддерживается только драйвером asyncpg, с другими
+        драйверами кэш остаётся выключенным.
+        """
+        if not self.enabled or self._task is not None:
+            return
+        url = make_url(database_url)
+        if url.get_driver_name() != 'asyncpg':
+            logger.warning(
+                'Кэш пользователей выключен: LISTEN требует asyncpg'
+            )
+            return
+        dsn = url.set(drivername='postgresql').render_as_string(
+            hide_password=False
+        )
+        self._task = asyncio.create_task(
+            self._listen_forever(dsn),
+            name='user-cache-listener'
+        )
+
+    async def stop(self) -> None:
+        """Отписаться от изменений и выключить кэш."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+
+user_cache = SharedUserCache(
+    maxsize=settings.user_cache_size,
+    ttl=settings.user_cache_ttl,
+    retry_interval=settings.user_cache_listen_retry_interval,
+)
@@ -0,0 +1,101 @@
+import asyncio
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import configure_logger, settings
+from app.core.db import AsyncSessionLocal
+from app.core.init_db import create_first_superuser
+from app.crud.task import task_crud
+from app.models.user import User
+
+logger = configure_logger(__name__)
+
+
+class Readiness:
+    """Состояние прогрева воркера и длительность его фаз."""
+
+    def __init__(self) -> None:
+        self.ready = False
+        self.phases: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Замерить фазу прогрева."""
+        start = time.perf_counter()
+        yield
+        self.phases[name] = round((time.perf_counter() - start) * 1000, 1)
+        logger.info('Фаза запуска %s: %s мс', name, self.phases[name])
+
+
+readiness = Readiness()
+
+
+async def warm_statements(session: AsyncSession) -> None:
+    """
+    Выполнить частые запросы, чтобы скомпилировать их в SQLAlchemy
+    и подготовить в asyncpg на соединении сессии. Запросы ищут
+    несуществующие строки и почти ничего не читают.
+    """
+    await session.execute(select(User).where(User.id == 0))
+    await task_crud.get(task_id=0, session=session)
+    await task_crud.get_update_date(task_id=0, session=session)
+    for cursor in (None, (datetime.now(), 0)):
+        await task_crud.filter_tasks(
+            session=session,
+            title=None,
+            start_date=None,
+            end_date=None,
+            limit=1,
+            cursor=cursor,
+        )
+
+
+async def warm_up() -> None:
+    """
+    Подготовить воркер к приёму запросов: создать суперпользователя,
+    открыть соединения пула и подготовить на них частые запросы.
+    """
+    start = time.perf_counter()
+    with readiness.phase('superuser'):
+        await create_first_superuser()
+
+    connections = min(
+        settings.warmup_connections,
+        settings.database_pool_size
+    )
+    sessions = [AsyncSessionLocal() for _ in range(connections)]
+    try:
+        # Сессии держат соединения одновременно, поэтому каждая
+        # получает своё соединение из пула.
+        with readiness.phase('pool'):
+            await asyncio.gather(
+                *(session.connection() for session in sessions)
+            )
+        with readiness.phase('statements'):
+            await asyncio.gather(
+                *(warm_statements(session) for session in sessions)
+            )
+    finally:
+        await asyncio.gather(*(session.close() for session in sessions))
+
+    readiness.phases['total'] = round((time.perf_counter() - start) * 1000, 1)
+    readiness.ready = True
+    logger.info('Воркер готов за %s мс', readiness.phases['total'])
+
+
+async def warm_up_until_ready() -> None:
+    """Повторять прогрев, пока он не завершится успешно."""
+    while True:
+        try:
+            await warm_up()
+            return
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error('Ошибка прогрева воркера - %s', e)
+            await asyncio.sleep(settings.warmup_retry_interval)
@@ -1,8 +1,18 @@
+from typing import Iterable
+
 from fastapi.encoders import jsonable_encoder
-from sqlalchemy import select
+from sqlalchemy import ARRAY, Integer, any_, literal, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
+def any_of(column, ids: Iterable[int]):
+    """
+    Условие column = ANY(:ids) с одним параметром-массивом вместо
+    IN со списком параметров, текст запроса не зависит от числа id.
+    """
+    return column == any_(literal(list(ids), type_=ARRAY(Integer)))
+
+
 class CRUDBase:
     """Базовый CRUD класс для моделей приложения."""
 
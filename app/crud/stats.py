@@ -0,0 +1,162 @@
+from typing import Dict, List, Tuple
+
+from sqlalchemy import func, literal, select, union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import configure_logger
+from app.models.references import task_responsibles_reference
+from app.models.stats import task_user_stats
+from app.models.task import Task
+from app.models.user import User
+
+logger = configure_logger(__name__)
+
+STATS_ROLES = ('creator', 'responsible')
+COUNTERS = ('active_count', 'expired_count', 'closed_count')
+
+
+class TaskStatsCRUD:
+    """
+    Чтение и сверка сводной таблицы счётчиков задач.
+    Счётчики изменяются триггерами базы данных в той же транзакции,
+    что и сами задачи, поэтому CRUD задач их не трогает.
+    """
+
+    async def get_totals(self, session: AsyncSession) -> dict:
+        """
+        Получить счётчики по всем задачам.
+        У каждой задачи ровно один создатель, поэтому сумма
+        по строкам роли 'creator' совпадает с числом задач.
+        """
+        row = (await session.execute(
+            select(*(
+                func.coalesce(func.sum(task_user_stats.c[name]), 0)
+                .label(name)
+                for name in COUNTERS
+            )).where(task_user_stats.c.role == 'creator')
+        )).mappings().one()
+        return dict(row)
+
+    async def get_by_role(
+        self,
+        session: AsyncSession,
+        role: str,
+        limit: int
+    ) -> List[dict]:
+        """Получить счётчики пользователей в роли по убыванию активных."""
+        stats = task_user_stats.c
+        rows = await session.execute(
+            select(
+                stats.user_id,
+                User.email,
+                *(stats[name] for name in COUNTERS)
+            )
+            .join(User, User.id == stats.user_id)
+            .where(
+                stats.role == role,
+                stats.active_count + stats.expired_count
+                + stats.closed_count > 0
+            )
+            .order_by(stats.active_count.desc(), stats.user_id)
+            .limit(limit)
+        )
+        return [dict(row) for row in rows.mappings()]
+
+    async def _count_actual(
+        self,
+        session: AsyncSession
+    ) -> Dict[Tuple[int, str], Tuple[int, int, int]]:
+        memberships = union_all(
+            select(
+                Task.creator_id.label('user_id'),
+                literal('creator').label('role'),
+                Task.is_active,
+                Task.expired_at,
+            ),
+            select(
+                task_responsibles_reference.c.user_id,
+                literal('responsible'),
+                Task.is_active,
+                Task.expired_at,
+            ).join(
+                Task,
+                Task.id == task_responsibles_reference.c.task_id
+            ),
+        ).subquery()
+        is_active = memberships.c.is_active
+        expired_at = memberships.c.expired_at
+        rows = await session.execute(
+            select(
+                memberships.c.user_id,
+                memberships.c.role,
+                func.count().filter(is_active & expired_at.is_(None)),
+                func.count().filter(is_active & expired_at.is_not(None)),
+                func.count().filter(~is_active),
+            ).group_by(memberships.c.user_id, memberships.c.role)
+        )
+        return {
+            (user_id, role): tuple(counters)
+            for user_id, role, *counters in rows
+        }
+
+    async def reconcile(self, session: AsyncSession) -> int:
+        """
+        Пересчитать счётчики по задачам и исправить расхождения.
+        Подсчёт и чтение счётчиков идут в одном снимке REPEATABLE READ
+        без блокировки таблиц: триггеры меняют счётчики в транзакции
+        самой задачи, поэтому расхождение в снимке - это накопленная
+        ошибка. Она прибавляется к текущим значениям отдельной
+        транзакцией, и изменения, сделанные после снимка, сохраняются.
+        Возвращает количество исправленных строк.
+        """
+        await session.connection(
+            execution_options={'isolation_level': 'REPEATABLE READ'}
+        )
+        actual = await self._count_actual(session)
+        stored = {
+            (user_id, role): tuple(counters)
+            for user_id, role, *counters in await session.execute(
+                select(
+                    task_user_stats.c.user_id,
+                    task_user_stats.c.role,
+                    *(task_user_stats.c[name] for name in COUNTERS)
+                )
+            )
+        }
+        await session.commit()
+
+        empty = (0, 0, 0)
+        fixes = []
+        for user_id, role in sorted(actual.keys() | stored.keys()):
+            deltas = [
+                actual_value - stored_value
+                for actual_value, stored_value in zip(
+                    actual.get((user_id, role), empty),
+                    stored.get((user_id, role), empty)
+                )
+            ]
+            if any(deltas):
+                fixes.append({
+                    'user_id': user_id,
+                    'role': role,
+                    **dict(zip(COUNTERS, deltas))
+                })
+        if fixes:
+            statement = pg_insert(task_user_stats)
+            await session.execute(
+                statement.on_conflict_do_update(
+                    index_elements=['user_id', 'role'],
+                    set_={
+                        name: task_user_stats.c[name]
+                        + statement.excluded[name]
+                        for name in COUNTERS
+                    }
+                ),
+                fixes
+            )
+            await session.commit()
+        return len(fixes)
+
+
+task_stats_crud = TaskStatsCRUD()
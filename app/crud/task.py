@@ -1,18 +1,116 @@
-from datetime import date
-from typing import Optional, List
+import html
+from datetime import date, datetime, timedelta
+from typing import (
+    AsyncIterator, Dict, Iterable, Optional, List, Sequence, Tuple
+)
 
-from sqlalchemy import select
+from sqlalchemy import (
+    Integer,
+    RowMapping,
+    Table,
+    cast,
+    delete,
+    exists,
+    func,
+    insert,
+    literal,
+    literal_column,
+    not_,
+    select,
+    tuple_,
+    union,
+    update,
+)
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased, selectinload
 
-from app.core.config import configure_logger
-from app.crud.base import CRUDBase
-from app.models.task import Task
+from app.core.config import configure_logger, settings
+from app.crud.base import CRUDBase, any_of
+from app.models.references import (
+    task_auditors_reference,
+    task_responsibles_reference
+)
+from app.models.task import TASK_SEARCH_CONFIG, Task, search_vector
 from app.models.user import User
-from app.schemas.task import TaskCreate, TaskUpdate
+from app.schemas.task import (
+    TaskBulkUpdate,
+    TaskCreate,
+    TaskMemberRole,
+    TaskUpdate,
+    TaskUserRole
+)
 
 logger = configure_logger(__name__)
 
+MEMBER_TABLES = {
+    TaskMemberRole.responsibles: task_responsibles_reference,
+    TaskMemberRole.auditors: task_auditors_reference,
+}
+
+# ts_headline отмечает совпадения управляющими символами, а не <b>:
+# текст задачи экранируется как HTML уже после подсветки.
+HIGHLIGHT_START = '\x02'
+HIGHLIGHT_STOP = '\x03'
+SEARCH_HEADLINE_OPTIONS = (
+    f'StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, '
+    'MaxFragments=2, MaxWords=30, MinWords=10'
+)
+
+
+def highlight(snippet: str) -> str:
+    """
+    Экранировать фрагмент ts_headline как HTML и обернуть
+    отмеченные совпадения в <b>.
+    """
+    return html.escape(snippet).replace(
+        HIGHLIGHT_START, '<b>'
+    ).replace(HIGHLIGHT_STOP, '</b>')
+
+
+def escape_like(value: str) -> str:
+    """Экранировать спецсимволы шаблона LIKE в пользовательской строке."""
+    return (
+        value.replace('\\', '\\\\')
+        .replace('%', '\\%')
+        .replace('_', '\\_')
+    )
+
+
+def task_representation(
+    row,
+    obj_in: TaskCreate,
+    creator: User,
+    users: Dict[int, str],
+) -> dict:
+    """
+    Собрать представление только что созданной задачи
+    из уже известных данных, без повторного чтения из базы данных.
+    """
+    return {
+        'id': row.id,
+        'title': obj_in.title,
+        'description': obj_in.description,
+        'expiration_date': obj_in.expiration_date,
+        'creator': {'id': creator.id, 'email': creator.email},
+        'responsibles': [
+            {'id': user_id, 'email': users[user_id]}
+            for user_id in dict.fromkeys(obj_in.responsibles)
+        ],
+        'auditors': [
+            {'id': user_id, 'email': users[user_id]}
+            for user_id in dict.fromkeys(obj_in.auditors or [])
+        ],
+        'is_active': row.is_active,
+        'create_date': row.create_date,
+        'update_date': row.update_date,
+        'is_expired': (
+            obj_in.expiration_date is not None
+            and obj_in.expiration_date < datetime.now()
+        ),
+    }
+
 
 class TaskCRUD(CRUDBase):
     """CRUD для объектов Task."""
@@ -25,6 +123,7 @@ class TaskCRUD(CRUDBase):
         """Получить задачу."""
         query = await session.execute(
             select(Task).options(
+                selectinload(Task.creator),
                 selectinload(Task.responsibles),
                 selectinload(Task.auditors)).where(Task.id == task_id)
         )
@@ -36,33 +135,232 @@ class TaskCRUD(CRUDBase):
         obj_in: TaskCreate,
         user: User,
         session: AsyncSession
-    ):
-        """Создать задачу."""
-        create_data = obj_in.model_dump()
-        create_data["creator_id"] = user.id
-        responsibles = create_data.pop('responsibles', [])
-        auditors = create_data.pop('auditors', [])
-
-        db_obj = self.model(**create_data)
-        responsibles = await session.execute(
-            select(User).where(User.id.in_(obj_in.responsibles))
-        )
-        responsibles = responsibles.scalars().all()
-        for responsible_user in responsibles:
-            db_obj.responsibles.append(responsible_user)
-
-        if auditors:
-            auditors = await session.execute(
-                select(User).where(User.id.in_(obj_in.auditors))
+    ) -> dict:
+        """
+        Создать задачу.
+        Пользователи проверяются одним запросом, задача вставляется
+        через INSERT ... RETURNING, а ответ собирается из уже
+        известных данных без повторного чтения задачи.
+        Если данные некорректны, выбрасывается ValueError.
+        """
+        users = await self.get_user_emails(
+            session,
+            (*obj_in.responsibles, *(obj_in.auditors or []))
+        )
+        _, errors = self._validate_creates([obj_in], users)
+        if errors:
+            raise ValueError(errors[0]['detail'])
+
+        task, = await self._insert_tasks([obj_in], user, users, session)
+        await session.commit()
+
+        return task
+
+    async def get_update_date(
+        self,
+        task_id: int,
+        session: AsyncSession
+    ) -> Optional[datetime]:
+        """Получить дату обновления задачи без загрузки связей."""
+        result = await session.execute(
+            select(Task.update_date).where(Task.id == task_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_page_version(
+        self,
+        session: AsyncSession,
+        title: Optional[str],
+        start_date: Optional[date],
+        end_date: Optional[date],
+        limit: int,
+        cursor: Optional[Tuple[datetime, int]] = None,
+    ) -> List[Tuple[int, datetime]]:
+        """
+        Получить id и дату обновления задач страницы - её версию.
+        Читается только индекс страницы, без загрузки связей.
+        """
+        query = self._page_query(
+            title, start_date, end_date, limit, cursor
+        ).with_only_columns(Task.id, Task.update_date)
+        result = await session.execute(query)
+        return [tuple(row) for row in result]
+
+    async def get_user_emails(
+        self,
+        session: AsyncSession,
+        user_ids: Iterable[int],
+    ) -> Dict[int, str]:
+        """Получить email существующих пользователей одним запросом."""
+        user_ids = set(user_ids)
+        if not user_ids:
+            return {}
+        result = await session.execute(
+            select(User.id, User.email).where(any_of(User.id, user_ids))
+        )
+        return dict(result.all())
+
+    async def _insert_references(
+        self,
+        session: AsyncSession,
+        table: Table,
+        task_ids: Sequence[int],
+        user_ids: Sequence[Iterable[int]],
+    ) -> None:
+        """Записать связи задач с пользователями одним executemany."""
+        params = [
+            {'task_id': task_id, 'user_id': user_id}
+            for task_id, ids in zip(task_ids, user_ids)
+            for user_id in dict.fromkeys(ids)
+        ]
+        if params:
+            await session.execute(insert(table), params)
+
+    async def _insert_tasks(
+        self,
+        objs_in: List[TaskCreate],
+        user: User,
+        users: Dict[int, str],
+        session: AsyncSession,
+    ) -> List[dict]:
+        """
+        Вставить задачи одним INSERT ... RETURNING и их связи
+        с пользователями, не фиксируя транзакцию.
+        """
+        result = await session.execute(
+            insert(Task).returning(
+                Task.id,
+                Task.is_active,
+                Task.create_date,
+                Task.update_date,
+                sort_by_parameter_order=True
+            ),
+            [
+                {
+                    'title': obj_in.title,
+                    'description': obj_in.description,
+                    'expiration_date': obj_in.expiration_date,
+                    'creator_id': user.id,
+                }
+                for obj_in in objs_in
+            ]
+        )
+        rows = result.all()
+        task_ids = [row.id for row in rows]
+
+        await self._insert_references(
+            session,
+            task_responsibles_reference,
+            task_ids,
+            [obj_in.responsibles for obj_in in objs_in]
+        )
+        await self._insert_references(
+            session,
+            task_auditors_reference,
+            task_ids,
+            [obj_in.auditors or [] for obj_in in objs_in]
+        )
+
+        return [
+            task_representation(row, obj_in, user, users)
+            for row, obj_in in zip(rows, objs_in)
+        ]
+
+    def _validate_creates(
+        self,
+        objs_in: List[TaskCreate],
+        users: Dict[int, str],
+    ) -> Tuple[List[TaskCreate], List[dict]]:
+        """
+        Проверить создаваемые задачи по уже загруженным пользователям.
+        Вернуть корректные задачи и ошибки с индексами остальных.
+        """
+        title_max_length = Task.title.type.length
+
+        valid, errors = [], []
+        for index, obj_in in enumerate(objs_in):
+            missing = sorted(
+                set(obj_in.responsibles).union(obj_in.auditors or [])
+                - users.keys()
             )
-            auditors = auditors.scalars().all()
-            for auditor_user in auditors:
-                db_obj.auditors.append(auditor_user)
+            if missing:
+                errors.append({
+                    'index': index,
+                    'detail': f'Пользователи с id {missing} не найдены.'
+                })
+            elif len(obj_in.title) > title_max_length:
+                errors.append({
+                    'index': index,
+                    'detail': (
+                        'Название задачи длиннее '
+                        f'{title_max_length} символов.'
+                    )
+                })
+            else:
+                valid.append(obj_in)
 
-        session.add(db_obj)
+        return valid, errors
+
+    async def create_bulk(
+        self,
+        objs_in: List[TaskCreate],
+        user: User,
+        session: AsyncSession,
+        partial: bool = False,
+    ) -> Tuple[List[dict], List[dict]]:
+        """
+        Создать пачку задач в одной транзакции.
+        Если partial - задачи с ошибками пропускаются, иначе
+        при любой ошибке не создаётся ни одной задачи.
+        Вернуть созданные задачи и ошибки с индексами в пачке.
+        """
+        users = await self.get_user_emails(
+            session,
+            (
+                user_id
+                for obj_in in objs_in
+                for user_id in (*obj_in.responsibles, *(obj_in.auditors or []))
+            )
+        )
+        valid, errors = self._validate_creates(objs_in, users)
+
+        if not valid or (errors and not partial):
+            return [], errors
+
+        created = await self._insert_tasks(valid, user, users, session)
         await session.commit()
 
-        return await self.get(db_obj.id, session)
+        return created, errors
+
+    async def _sync_references(
+        self,
+        session: AsyncSession,
+        table: Table,
+        task_id: int,
+        user_ids: Iterable[int],
+    ) -> bool:
+        """
+        Привести связи задачи к списку user_ids, изменив только разницу:
+        один DELETE лишних строк и один INSERT ... ON CONFLICT DO NOTHING
+        недостающих. Несуществующие пользователи пропускаются.
+        Вернуть True, если связи изменились.
+        """
+        user_ids = set(user_ids)
+        removed = await session.execute(
+            delete(table).where(
+                table.c.task_id == task_id,
+                not_(any_of(table.c.user_id, user_ids)),
+            )
+        )
+        added = await session.execute(
+            pg_insert(table).from_select(
+                ['task_id', 'user_id'],
+                select(literal(task_id, Integer), User.id).where(
+                    any_of(User.id, user_ids)
+                )
+            ).on_conflict_do_nothing()
+        )
+        return bool(removed.rowcount or added.rowcount)
 
     async def update(
         self,
@@ -73,65 +371,483 @@ class TaskCRUD(CRUDBase):
         """Обновить существующую задачу."""
         update_data = obj_in.model_dump(exclude_unset=True)
 
-        responsibles_ids = update_data.pop('responsibles')
-        auditors_ids = update_data.pop('auditors')
+        responsibles_ids = update_data.pop('responsibles', None)
+        auditors_ids = update_data.pop('auditors', None)
+        if update_data.pop('finished', None):
+            update_data['is_active'] = False
+            update_data['close_date'] = db_obj.close_date or datetime.now()
+        if 'expiration_date' in update_data:
+            update_data['expired_at'] = None
 
         for field, value in update_data.items():
             setattr(db_obj, field, value)
 
+        references_changed = False
         if responsibles_ids is not None:
-            new_responsibles = await session.execute(
-                select(User).where(User.id.in_(responsibles_ids))
+            references_changed |= await self._sync_references(
+                session,
+                task_responsibles_reference,
+                db_obj.id,
+                responsibles_ids
             )
-            db_obj.responsibles[:] = new_responsibles.scalars().all()
-
         if auditors_ids is not None:
-            new_auditors = await session.execute(
-                select(User).where(User.id.in_(auditors_ids))
+            references_changed |= await self._sync_references(
+                session,
+                task_auditors_reference,
+                db_obj.id,
+                auditors_ids
             )
-            db_obj.auditors[:] = new_auditors.scalars().all()
+        if references_changed:
+            # Изменение только связей не обновляет строку задачи,
+            # а от update_date зависит ETag задачи.
+            db_obj.update_date = datetime.now()
 
         session.add(db_obj)
         await session.commit()
         await session.refresh(db_obj)
+        if references_changed:
+            await session.refresh(db_obj, ['responsibles', 'auditors'])
 
         return db_obj
 
-    async def filter_tasks(
+    async def get_creator_id(
+        self,
+        task_id: int,
+        session: AsyncSession
+    ) -> Optional[int]:
+        """Получить id постановщика задачи без загрузки задачи."""
+        result = await session.execute(
+            select(Task.creator_id).where(Task.id == task_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def add_member(
+        self,
+        task_id: int,
+        user_id: int,
+        role: TaskMemberRole,
+        session: AsyncSession
+    ) -> bool:
+        """
+        Добавить пользователя в ответственные или наблюдатели задачи
+        одной вставкой строки связи. Вернуть False, если он уже там.
+        Для несуществующего пользователя выбрасывается IntegrityError.
+        """
+        result = await session.execute(
+            pg_insert(MEMBER_TABLES[role]).values(
+                task_id=task_id,
+                user_id=user_id
+            ).on_conflict_do_nothing()
+        )
+        added = bool(result.rowcount)
+        if added:
+            await self._touch(task_id, session)
+        await session.commit()
+        return added
+
+    async def remove_member(
+        self,
+        task_id: int,
+        user_id: int,
+        role: TaskMemberRole,
+        session: AsyncSession
+    ) -> bool:
+        """
+        Удалить пользователя из ответственных или наблюдателей задачи
+        одним удалением строки связи. Последний ответственный
+        не удаляется. Вернуть True, если строка удалена.
+        """
+        table = MEMBER_TABLES[role]
+        query = delete(table).where(
+            table.c.task_id == task_id,
+            table.c.user_id == user_id,
+        )
+        if role == TaskMemberRole.responsibles:
+            other = table.alias()
+            query = query.where(
+                exists().where(
+                    other.c.task_id == task_id,
+                    other.c.user_id != user_id,
+                )
+            )
+        result = await session.execute(query)
+        removed = bool(result.rowcount)
+        if removed:
+            await self._touch(task_id, session)
+        await session.commit()
+        return removed
+
+    async def _touch(self, task_id: int, session: AsyncSession) -> None:
+        """Обновить update_date задачи после изменения её связей."""
+        await session.execute(
+            update(Task).where(
+                Task.id == task_id
+            ).values(
+                update_date=datetime.now()
+            ).execution_options(
+                synchronize_session=False
+            )
+        )
+
+    async def update_bulk(
         self,
+        obj_in: TaskBulkUpdate,
+        user: User,
         session: AsyncSession,
+    ) -> List[int]:
+        """
+        Обновить задачи по списку id и/или фильтру одним UPDATE.
+        Право на изменение проверяется в самом запросе: обычный
+        пользователь меняет только задачи, где он постановщик.
+        По фильтру меняется не больше task_bulk_max_items задач,
+        иначе - ValueError. Вернуть id изменённых задач.
+        """
+        values = obj_in.changes.model_dump(exclude_unset=True)
+        if values.get('title', '') is None:
+            values.pop('title')
+        if values.pop('finished', None):
+            values['is_active'] = False
+            values['close_date'] = func.coalesce(
+                Task.close_date,
+                datetime.now()
+            )
+        if 'expiration_date' in values:
+            values['expired_at'] = None
+        if not values:
+            return []
+
+        conditions = []
+        if obj_in.ids is not None:
+            conditions.append(any_of(Task.id, obj_in.ids))
+        if not user.is_superuser:
+            conditions.append(Task.creator_id == user.id)
+        if obj_in.filter is not None:
+            # Строки под фильтром блокируются и считаются заранее,
+            # чтобы UPDATE не затронул больше разрешённого.
+            target = self._apply_filters(
+                select(Task.id).where(*conditions),
+                obj_in.filter.title,
+                obj_in.filter.start_date,
+                obj_in.filter.end_date,
+            ).order_by(Task.id).limit(
+                settings.task_bulk_max_items + 1
+            ).with_for_update()
+            target_ids = (await session.execute(target)).scalars().all()
+            if len(target_ids) > settings.task_bulk_max_items:
+                await session.rollback()
+                raise ValueError(
+                    'Фильтр выбирает больше '
+                    f'{settings.task_bulk_max_items} задач, уточните его.'
+                )
+            conditions = [any_of(Task.id, target_ids)]
+        query = update(Task).values(**values).where(*conditions)
+
+        result = await session.execute(
+            query.returning(Task.id).execution_options(
+                synchronize_session=False
+            )
+        )
+        updated_ids = result.scalars().all()
+        await session.commit()
+
+        return updated_ids
+
+    def _apply_filters(
+        self,
+        query,
         title: Optional[str],
         start_date: Optional[date],
         end_date: Optional[date],
-    ) -> Optional[List[Task]]:
-        """Отфильтровать задачи по заданным параметрам."""
+    ):
+        """Добавить к запросу фильтры по названию и дате создания."""
+        if title:
+            # Подстрочный поиск обслуживается триграммным GIN-индексом
+            # ix_task_title_trgm для подстрок от трёх символов.
+            query = query.where(
+                Task.title.ilike(f'%{escape_like(title)}%', escape='\\')
+            )
+        if start_date:
+            query = query.where(Task.create_date >= start_date)
+        if end_date:
+            query = query.where(
+                Task.create_date < end_date + timedelta(days=1)
+            )
+        return query
+
+    def _page_query(
+        self,
+        title: Optional[str],
+        start_date: Optional[date],
+        end_date: Optional[date],
+        limit: int,
+        cursor: Optional[Tuple[datetime, int]] = None,
+    ):
+        """
+        Собрать запрос страницы задач от новых к старым по ключу
+        (create_date, id), начиная после cursor.
+        """
         query = select(Task).options(
+            selectinload(Task.creator),
             selectinload(Task.responsibles),
             selectinload(Task.auditors),
         )
+        query = self._apply_filters(query, title, start_date, end_date)
 
-        if title:
-            query = query.where(Task.title.ilike(f"%{title}%"))
-        if start_date:
-            query = query.where(Task.created_at >= start_date)
-        if end_date:
-            query = query.where(Task.created_at <= end_date)
+        if cursor:
+            query = query.where(tuple_(Task.create_date, Task.id) < cursor)
+        return query.order_by(
+            Task.create_date.desc(),
+            Task.id.desc()
+        ).limit(limit)
+
+    async def filter_tasks(
+        self,
+        session: AsyncSession,
+        title: Optional[str],
+        start_date: Optional[date],
+        end_date: Optional[date],
+        limit: int,
+        cursor: Optional[Tuple[datetime, int]] = None,
+    ) -> List[Task]:
+        """
+        Отфильтровать задачи по заданным параметрам.
+        Задачи отдаются страницами от новых к старым по ключу
+        (create_date, id), следующая страница начинается после cursor.
+        """
+        query = self._page_query(title, start_date, end_date, limit, cursor)
 
         result = await session.execute(query)
         tasks = result.scalars().all()
 
         return tasks
 
-    async def get_tasks_by_user_id(
+    async def stream_tasks(
+        self,
+        session: AsyncSession,
+        title: Optional[str],
+        start_date: Optional[date],
+        end_date: Optional[date],
+        fetch_size: int,
+    ) -> AsyncIterator[Sequence[RowMapping]]:
+        """
+        Построчно выгрузить отфильтрованные задачи через серверный курсор.
+        Строки отдаются пачками по fetch_size, ORM-объекты не создаются.
+        """
+        responsibles = select(
+            func.array_agg(task_responsibles_reference.c.user_id)
+        ).where(
+            task_responsibles_reference.c.task_id == Task.id
+        ).scalar_subquery()
+        auditors = select(
+            func.array_agg(task_auditors_reference.c.user_id)
+        ).where(
+            task_auditors_reference.c.task_id == Task.id
+        ).scalar_subquery()
+
+        query = select(
+            Task.id,
+            Task.title,
+            Task.description,
+            Task.is_active,
+            Task.creator_id,
+            responsibles.label('responsibles'),
+            auditors.label('auditors'),
+            Task.create_date,
+            Task.update_date,
+            Task.close_date,
+            Task.expiration_date,
+        )
+        query = self._apply_filters(query, title, start_date, end_date)
+        query = query.order_by(Task.id).execution_options(
+            yield_per=fetch_size
+        )
+
+        result = await session.stream(query)
+        async for rows in result.mappings().partitions():
+            yield rows
+
+    def _search_query(self, text: str, limit: int):
+        """Собрать запрос полнотекстового поиска с рангом и фрагментом."""
+        config = cast(literal_column(f"'{TASK_SEARCH_CONFIG}'"), REGCONFIG)
+        ts_query = func.websearch_to_tsquery(config, text)
+        document_vector = search_vector()
+        rank = func.ts_rank_cd(document_vector, ts_query).label('rank')
+        # Отметки совпадений удаляются из текста, чтобы задача
+        # не могла подделать подсветку.
+        document = func.translate(
+            func.concat_ws(' ', Task.title, Task.description),
+            HIGHLIGHT_START + HIGHLIGHT_STOP,
+            '',
+        )
+        snippet = func.ts_headline(
+            config,
+            document,
+            ts_query,
+            SEARCH_HEADLINE_OPTIONS,
+        ).label('snippet')
+
+        query = select(Task, rank, snippet).options(
+            selectinload(Task.creator),
+            selectinload(Task.responsibles),
+            selectinload(Task.auditors),
+        ).where(
+            document_vector.op('@@')(ts_query)
+        ).order_by(
+            rank.desc(),
+            Task.id.desc()
+        ).limit(limit)
+        return query
+
+    async def search(
+        self,
+        session: AsyncSession,
+        text: str,
+        limit: int,
+    ) -> List[Tuple[Task, float, str]]:
+        """
+        Найти задачи полнотекстовым поиском по названию и описанию.
+        Вернуть задачи с рангом релевантности и фрагментом с подсветкой,
+        экранированным как HTML.
+        """
+        result = await session.execute(self._search_query(text, limit))
+        return [
+            (task, rank, highlight(snippet))
+            for task, rank, snippet in result
+        ]
+
+    async def mark_expired(
+        self,
+        session: AsyncSession,
+        now: datetime,
+        batch_size: int,
+    ) -> List[int]:
+        """
+        Отметить до batch_size активных задач, срок которых истёк
+        до now, одним UPDATE и вернуть их id.
+        Кандидаты выбираются по частичному индексу
+        ix_task_expiration_date_unswept. expired_at берётся в момент
+        UPDATE, а не now: пакеты фиксируются по очереди, и курсор
+        (expired_at, id) не должен пропускать строки следующих пакетов.
+        """
+        candidate = aliased(Task)
+        candidates = select(candidate.id).where(
+            candidate.is_active,
+            candidate.expired_at.is_(None),
+            candidate.expiration_date < now,
+        ).order_by(
+            candidate.expiration_date
+        ).limit(batch_size).with_for_update(skip_locked=True)
+
+        result = await session.execute(
+            update(Task).where(
+                Task.id.in_(candidates)
+            ).values(
+                expired_at=datetime.now()
+            ).returning(Task.id).execution_options(
+                synchronize_session=False
+            )
+        )
+        expired_ids = result.scalars().all()
+        await session.commit()
+
+        return expired_ids
+
+    async def get_expired(
         self,
         session: AsyncSession,
+        since: Optional[datetime],
+        limit: int,
+        cursor: Optional[Tuple[datetime, int]] = None,
+    ) -> List[Task]:
+        """
+        Получить задачи, истёкшие после since, в порядке
+        (expired_at, id); следующая страница начинается после cursor.
+        """
+        query = select(Task).options(
+            selectinload(Task.creator),
+            selectinload(Task.responsibles),
+            selectinload(Task.auditors),
+        ).where(Task.expired_at.is_not(None))
+
+        if since:
+            query = query.where(Task.expired_at > since)
+        if cursor:
+            query = query.where(tuple_(Task.expired_at, Task.id) > cursor)
+        query = query.order_by(Task.expired_at, Task.id).limit(limit)
+
+        result = await session.execute(query)
+        return result.scalars().all()
+
+    def _user_tasks_query(
+        self,
         user_id: int,
+        role: TaskUserRole,
+        title: Optional[str],
+        start_date: Optional[date],
+        end_date: Optional[date],
+        limit: int,
+        cursor: Optional[Tuple[datetime, int]] = None,
     ):
         """
-        Получить все задачи, где создателем
-        является заданный пользователь.
+        Собрать запрос страницы задач, в которых пользователь
+        участвует в заданной роли.
+        Каждая роль отбирается по своему индексу:
+        ix_task_creator_id_create_date_id, который отдаёт задачи
+        создателя уже в порядке страницы, или обратным индексам
+        (user_id, task_id) таблиц связей.
         """
-        query = select(self.model).where(self.model.creator_id == user_id)
+        # Из задач создателя на страницу попадут не больше limit
+        # первых после cursor: их отдаёт индекс без сортировки
+        # всех задач пользователя.
+        created = self._apply_filters(
+            select(Task.id).where(Task.creator_id == user_id),
+            title, start_date, end_date
+        )
+        if cursor:
+            created = created.where(tuple_(Task.create_date, Task.id) < cursor)
+        created = created.order_by(
+            Task.create_date.desc(),
+            Task.id.desc()
+        ).limit(limit).correlate(None).subquery()
+        responsible = select(task_responsibles_reference.c.task_id).where(
+            task_responsibles_reference.c.user_id == user_id
+        )
+        audited = select(task_auditors_reference.c.task_id).where(
+            task_auditors_reference.c.user_id == user_id
+        )
+        if role == TaskUserRole.creator:
+            condition = Task.creator_id == user_id
+        elif role == TaskUserRole.responsible:
+            condition = Task.id.in_(responsible)
+        elif role == TaskUserRole.auditor:
+            condition = Task.id.in_(audited)
+        else:
+            condition = Task.id.in_(
+                union(select(created.c.id), responsible, audited)
+            )
+
+        return self._page_query(
+            title, start_date, end_date, limit, cursor
+        ).where(condition)
+
+    async def get_tasks_by_user_id(
+        self,
+        session: AsyncSession,
+        user_id: int,
+        role: TaskUserRole,
+        title: Optional[str],
+        start_date: Optional[date],
+        end_date: Optional[date],
+        limit: int,
+        cursor: Optional[Tuple[datetime, int]] = None,
+    ) -> List[Task]:
+        """
+        Получить страницу задач, в которых пользователь участвует
+        в заданной роли, одним запросом.
+        """
+        query = self._user_tasks_query(
+            user_id, role, title, start_date, end_date, limit, cursor
+        )
 
         result = await session.execute(query)
 
@@ -1,9 +1,19 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 
 from app.core.config import settings, configure_logger
-from app.core.init_db import create_first_superuser
+from app.core.db import engine
+from app.core.jobs import get_periodic_jobs
+from app.core.log import RequestContextMiddleware
+from app.core.metrics import MetricsMiddleware, shared_metrics
+from app.core.password import password_helper
+from app.core.query_debug import QueryDebugMiddleware
+from app.core.replica import replica_router
+from app.core.user_cache import user_cache
+from app.core.warmup import warm_up_until_ready
 from app.api.routers import main_router
 
 logger = configure_logger(__name__)
@@ -12,15 +22,49 @@ logger = configure_logger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info('Приложение запускается')
-    await create_first_superuser()
-    logger.info('Суперпользователь создан')
+    # Прогрев идёт в фоне: сервер сразу отвечает на /health/live,
+    # а /health/ready возвращает 503, пока прогрев не закончится.
+    warmup = asyncio.create_task(warm_up_until_ready(), name='warmup')
+    user_cache.start(settings.database_url)
+    jobs = get_periodic_jobs()
+    for job in jobs:
+        job.start()
+    if settings.metrics_enabled and settings.metrics_multiprocess_dir:
+        shared_metrics.start(
+            settings.metrics_multiprocess_dir,
+            settings.metrics_flush_interval
+        )
     yield
 
+    warmup.cancel()
+    with suppress(asyncio.CancelledError):
+        await warmup
+    for job in jobs:
+        await job.stop()
+    await shared_metrics.stop()
+    await user_cache.stop()
+    password_helper.shutdown()
+    # Соединения закрываются явно, чтобы Postgres не держал
+    # обрывки сессий остановленного воркера.
+    await replica_router.dispose()
+    await engine.dispose()
     logger.warning('Приложение остановлено')
 
 
 app = FastAPI(
     title=settings.app_title,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 app.include_router(main_router)
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+if settings.query_debug_enabled:
+    app.add_middleware(QueryDebugMiddleware)
+app.add_middleware(
+    RequestContextMiddleware,
+    logger=(
+        configure_logger('app.requests') if settings.logging_requests
+        else None
+    )
+)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Table
+from sqlalchemy import Column, ForeignKey, Index, Table
 
 from app.core.db import Base
 
@@ -9,7 +9,10 @@ task_responsibles_reference = Table(
     "task_responsibles_reference",
     Base.metadata,
     Column('task_id', ForeignKey('task.id'), primary_key=True),
-    Column('user_id', ForeignKey('user.id'), primary_key=True)
+    Column('user_id', ForeignKey('user.id'), primary_key=True),
+    # Первичный ключ (task_id, user_id) не помогает искать задачи
+    # пользователя, поэтому нужен обратный индекс (user_id, task_id).
+    Index('ix_task_responsibles_reference_user_id', 'user_id', 'task_id')
 )
 
 # Таблица для сохранения many-to-many связей
@@ -18,5 +21,6 @@ task_auditors_reference = Table(
     "task_auditors_reference",
     Base.metadata,
     Column('task_id', ForeignKey('task.id'), primary_key=True),
-    Column('user_id', ForeignKey('user.id'), primary_key=True)
+    Column('user_id', ForeignKey('user.id'), primary_key=True),
+    Index('ix_task_auditors_reference_user_id', 'user_id', 'task_id')
 )
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, ForeignKey, Integer, String, Table
+
+from app.core.db import Base
+
+
+# Сводная таблица счётчиков задач по пользователям и ролям
+# ('creator', 'responsible'). Поддерживается триггерами на task
+# и task_responsibles_reference, расхождения исправляет сверка.
+task_user_stats = Table(
+    'task_user_stats',
+    Base.metadata,
+    Column('user_id', ForeignKey('user.id'), primary_key=True),
+    Column('role', String(16), primary_key=True),
+    Column('active_count', Integer, nullable=False, default=0),
+    Column('expired_count', Integer, nullable=False, default=0),
+    Column('closed_count', Integer, nullable=False, default=0),
+)
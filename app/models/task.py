@@ -5,8 +5,11 @@ from sqlalchemy import (
     Column,
     ForeignKey,
     DateTime,
+    Index,
     String,
     Text,
+    func,
+    text,
 )
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
@@ -18,10 +21,46 @@ from app.models.references import (
     task_responsibles_reference
 )
 
+# Конфигурация полнотекстового поиска по задачам.
+TASK_SEARCH_CONFIG = 'russian'
+
 
 class Task(DBObject):
     """Модель задачи."""
 
+    __table_args__ = (
+        Index(
+            'ix_task_creator_id_create_date_id',
+            'creator_id',
+            text('create_date DESC'),
+            text('id DESC')
+        ),
+        Index('ix_task_create_date_id', 'create_date', 'id'),
+        Index(
+            'ix_task_expiration_date_active',
+            'expiration_date',
+            postgresql_where=text('is_active')
+        ),
+        # Очередь для фонового поиска истёкших задач.
+        Index(
+            'ix_task_expiration_date_unswept',
+            'expiration_date',
+            postgresql_where=text('is_active AND expired_at IS NULL')
+        ),
+        Index(
+            'ix_task_expired_at_id',
+            'expired_at',
+            'id',
+            postgresql_where=text('expired_at IS NOT NULL')
+        ),
+        Index(
+            'ix_task_title_trgm',
+            'title',
+            postgresql_using='gin',
+            postgresql_ops={'title': 'gin_trgm_ops'}
+        ),
+    )
+
     title = Column(String(100), nullable=False)
     description = Column(Text, nullable=True)
     is_active = Column(Boolean, default=True, nullable=False)
@@ -44,6 +83,8 @@ class Task(DBObject):
         back_populates='tasks_as_auditor'
     )
     expiration_date = Column(DateTime, nullable=True)
+    # Момент, когда фоновая задача зафиксировала истечение срока.
+    expired_at = Column(DateTime, nullable=True)
 
     @hybrid_property
     def is_expired(self):
@@ -57,9 +98,28 @@ class Task(DBObject):
     def is_expired(cls):
         """Проверить, что задача не просрочена в SQL-запросе."""
         return case(
-            [(cls.expiration_date == None, False)],  # noqa
+            (cls.expiration_date == None, False),  # noqa
             else_=datetime.now() > cls.expiration_date
         )
 
     def __repr__(self):
         return f'Задача {self.title}, постановщик - {self.creator_id}.'
+
+
+def search_vector():
+    """
+    Получить поисковый вектор задачи по названию и описанию.
+    Постоянные части выражения подставляются в SQL как есть, а не
+    параметрами: иначе выражение не совпадёт с индексом
+    ix_task_search_vector и планировщик его не использует.
+    """
+    empty = text("''")
+    return func.to_tsvector(
+        text(f"'{TASK_SEARCH_CONFIG}'"),
+        func.coalesce(Task.title, empty).concat(
+            text("' '")
+        ).concat(func.coalesce(Task.description, empty))
+    )
+
+
+Index('ix_task_search_vector', search_vector(), postgresql_using='gin')
@@ -0,0 +1,26 @@
+from pydantic import BaseModel, Field
+
+
+class PoolStatsRead(BaseModel):
+    """Схема статистики пула соединений с базой данных."""
+
+    size: int = Field(..., title='Размер пула')
+    checked_in: int = Field(..., title='Свободные соединения')
+    checked_out: int = Field(..., title='Выданные соединения')
+    overflow: int = Field(..., title='Соединения сверх размера пула')
+    checkouts: int = Field(..., title='Всего выдач соединений')
+    checkout_timeouts: int = Field(
+        ...,
+        title='Выдачи, завершившиеся таймаутом'
+    )
+    checkout_wait_avg_ms: float = Field(
+        ...,
+        title='Среднее ожидание соединения, мс'
+    )
+    checkout_wait_max_ms: float = Field(
+        ...,
+        title='Максимальное ожидание соединения, мс'
+    )
+    connects: int = Field(..., title='Открыто соединений')
+    closes: int = Field(..., title='Закрыто соединений')
+    invalidations: int = Field(..., title='Инвалидировано соединений')
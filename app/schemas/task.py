@@ -1,7 +1,8 @@
-from datetime import datetime
+from datetime import date, datetime
+from enum import Enum
 from typing import List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 from app.core.config import settings
 from app.schemas.user import UserTaskRepresentation
@@ -112,6 +113,10 @@ class TaskRead(TaskBase):
         None,
         title='Дата истечения срока выполнения задачи',
     )
+    expired_at: Optional[datetime] = Field(
+        None,
+        title='Дата, когда зафиксировано истечение срока задачи',
+    )
 
     class Config:
         from_attributes = True
@@ -191,3 +196,252 @@ class TaskUpdate(TaskBase):
                 'finished': False
             }
         }
+
+
+class TaskPage(BaseModel):
+    """Схема страницы списка задач."""
+
+    items: List[TaskRead] = Field(
+        ...,
+        title='Задачи на странице'
+    )
+    next_cursor: Optional[str] = Field(
+        None,
+        title='Курсор следующей страницы'
+    )
+
+    class Config:
+        title = 'Схема страницы задач'
+
+
+class TaskSearchResult(BaseModel):
+    """Схема результата полнотекстового поиска задач."""
+
+    task: TaskRead = Field(
+        ...,
+        title='Найденная задача'
+    )
+    rank: float = Field(
+        ...,
+        title='Релевантность'
+    )
+    snippet: str = Field(
+        ...,
+        title='Фрагмент текста с подсветкой совпадений',
+        description=(
+            'Текст задачи экранирован как HTML, совпадения'
+            ' обёрнуты в <b>'
+        )
+    )
+
+    class Config:
+        title = 'Схема результата поиска задачи'
+
+
+class TaskBulkError(BaseModel):
+    """Схема ошибки обработки задачи в пачке."""
+
+    index: int = Field(
+        ...,
+        title='Порядковый номер задачи в пачке'
+    )
+    detail: str = Field(
+        ...,
+        title='Описание ошибки'
+    )
+
+
+class TaskBulkCreateResult(BaseModel):
+    """Схема результата пакетного создания задач."""
+
+    created: List[TaskRead] = Field(
+        ...,
+        title='Созданные задачи'
+    )
+    errors: List[TaskBulkError] = Field(
+        default_factory=list,
+        title='Задачи, которые не удалось создать'
+    )
+
+    class Config:
+        title = 'Схема результата пакетного создания задач'
+
+
+class TaskFilter(BaseModel):
+    """Схема фильтра задач."""
+
+    title: Optional[str] = Field(
+        None,
+        min_length=1,
+        title='Название, или его часть, для фильтрации задач по названию'
+    )
+    start_date: Optional[date] = Field(
+        None,
+        title='Начальная дата для фильтрации задач по дате создания'
+    )
+    end_date: Optional[date] = Field(
+        None,
+        title='Конечная дата для фильтрации задач по дате создания'
+    )
+
+    class Config:
+        title = 'Схема фильтра задач'
+        extra = 'forbid'
+
+
+class TaskBulkChanges(TaskBase):
+    """Схема изменений, применяемых к пачке задач."""
+
+    creator_id: int = Field(
+        None,
+        title='Постановщик задачи'
+    )
+    finished: Optional[bool] = Field(
+        False,
+        description='Закрыть задачи'
+    )
+
+    class Config:
+        title = 'Схема изменений пачки задач'
+        extra = 'forbid'
+
+
+class TaskBulkUpdate(BaseModel):
+    """Схема пакетного обновления задач."""
+
+    ids: Optional[List[int]] = Field(
+        None,
+        title='Идентификаторы изменяемых задач',
+        min_length=1,
+        max_length=settings.task_bulk_max_items,
+    )
+    filter: Optional[TaskFilter] = Field(
+        None,
+        title='Фильтр изменяемых задач'
+    )
+    changes: TaskBulkChanges = Field(
+        ...,
+        title='Изменения'
+    )
+
+    @model_validator(mode='after')
+    def check_target(self):
+        """
+        Проверить, что задан список задач или непустой фильтр:
+        пустой фильтр выбрал бы все доступные пользователю задачи.
+        """
+        if self.ids is None and self.filter is None:
+            raise ValueError('Нужно указать ids или filter.')
+        if (
+            self.filter is not None
+            and not self.filter.model_dump(exclude_none=True)
+        ):
+            raise ValueError('В filter нужно указать хотя бы одно поле.')
+        return self
+
+    class Config:
+        title = 'Схема пакетного обновления задач'
+        extra = 'forbid'
+        json_schema_extra = {
+            'example': {
+                'ids': [1, 2, 3],
+                'changes': {
+                    'finished': True
+                }
+            }
+        }
+
+
+class TaskBulkUpdateResult(BaseModel):
+    """Схема результата пакетного обновления задач."""
+
+    updated: List[int] = Field(
+        ...,
+        title='Изменённые задачи'
+    )
+    skipped: List[int] = Field(
+        default_factory=list,
+        title='Задачи из списка, которые не найдены или недоступны'
+    )
+
+    class Config:
+        title = 'Схема результата пакетного обновления задач'
+
+
+class TaskExportFormat(str, Enum):
+    """Форматы выгрузки задач."""
+
+    ndjson = 'ndjson'
+    csv = 'csv'
+
+
+class TaskMemberRole(str, Enum):
+    """Роли пользователей в задаче, задаваемые связями."""
+
+    responsibles = 'responsibles'
+    auditors = 'auditors'
+
+
+class TaskUserRole(str, Enum):
+    """Роли, в которых пользователь может участвовать в задаче."""
+
+    creator = 'creator'
+    responsible = 'responsible'
+    auditor = 'auditor'
+    any = 'any'
+
+
+class TaskCounters(BaseModel):
+    """Схема счётчиков задач по состояниям."""
+
+    active_count: int = Field(
+        ...,
+        title='Активные задачи'
+    )
+    expired_count: int = Field(
+        ...,
+        title='Активные задачи с истёкшим сроком'
+    )
+    closed_count: int = Field(
+        ...,
+        title='Закрытые задачи'
+    )
+
+    class Config:
+        title = 'Схема счётчиков задач'
+
+
+class UserTaskStats(TaskCounters):
+    """Схема счётчиков задач пользователя в одной роли."""
+
+    user_id: int = Field(
+        ...,
+        title='ID пользователя'
+    )
+    email: str = Field(
+        ...,
+        title='Email пользователя'
+    )
+
+    class Config:
+        title = 'Схема счётчиков задач пользователя'
+
+
+class TaskStats(BaseModel):
+    """Схема сводной статистики задач."""
+
+    total: TaskCounters = Field(
+        ...,
+        title='Все задачи'
+    )
+    creators: List[UserTaskStats] = Field(
+        ...,
+        title='Счётчики по создателям'
+    )
+    responsibles: List[UserTaskStats] = Field(
+        ...,
+        title='Счётчики по ответственным'
+    )
+
+    class Config:
+        title = 'Схема статистики задач'
@@ -0,0 +1,105 @@
+"""
+Плагин pytest, ограничивающий число SQL-запросов в тесте.
+
+Подключается в conftest.py:
+
+    pytest_plugins = ['app.testing.query_budget']
+
+После этого тест можно пометить бюджетом запросов на весь вызов:
+
+    @pytest.mark.query_budget(3)
+    async def test_get_task(client): ...
+
+или проверить отдельный участок фикстурой:
+
+    async def test_list(client, query_budget):
+        with query_budget(2):
+            await client.get('/tasks/')
+
+Учитываются запросы всех движков процесса, включая реплики.
+Нужен pytest 8 или новее, см. requirements-dev.txt.
+"""
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.query_debug import QueryRecorder, shorten
+
+REPORT_SHAPES = 5
+
+
+@contextmanager
+def record_queries() -> Iterator[QueryRecorder]:
+    """Записывать запросы всех движков, пока открыт контекст."""
+    recorder = QueryRecorder()
+
+    def before_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        context._query_budget_start = time.perf_counter()
+
+    def after_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        recorder.record(
+            statement,
+            time.perf_counter() - context._query_budget_start
+        )
+
+    event.listen(Engine, 'before_cursor_execute', before_cursor_execute)
+    event.listen(Engine, 'after_cursor_execute', after_cursor_execute)
+    try:
+        yield recorder
+    finally:
+        event.remove(Engine, 'after_cursor_execute', after_cursor_execute)
+        event.remove(Engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def check_budget(recorder: QueryRecorder, budget: int) -> None:
+    """Провалить тест, если запросов больше бюджета."""
+    if recorder.count <= budget:
+        return
+    shapes = '\n'.join(
+        f'  {count} x {shorten(statement)}'
+        for statement, count in recorder.shapes.most_common(REPORT_SHAPES)
+    )
+    pytest.fail(
+        f'Выполнено {recorder.count} SQL-запросов при бюджете {budget}:\n'
+        f'{shapes}',
+        pytrace=False
+    )
+
+
+@contextmanager
+def _query_budget(budget: int) -> Iterator[QueryRecorder]:
+    with record_queries() as recorder:
+        yield recorder
+    check_budget(recorder, budget)
+
+
+def pytest_configure(config) -> None:
+    config.addinivalue_line(
+        'markers',
+        'query_budget(n): провалить тест, выполнивший больше n SQL-запросов'
+    )
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    marker = item.get_closest_marker('query_budget')
+    if marker is None:
+        return (yield)
+    with record_queries() as recorder:
+        result = yield
+    check_budget(recorder, marker.args[0])
+    return result
+
+
+@pytest.fixture
+def query_budget():
+    """Получить контекстный менеджер проверки бюджета запросов."""
+    return _query_budget
@@ -0,0 +1,373 @@
+"""
+Нагрузочный тест API задач.
+
+Приложение запускается в том же процессе (вместе с lifespan) и
+вызывается через httpx.AsyncClient без сети. Каждый виртуальный
+пользователь регистрируется, получает JWT через /auth/jwt/login и
+выполняет операции в заданной пропорции. Для каждой операции
+считаются пропускная способность, задержки p50/p95/p99 и ошибки.
+Результат сохраняется в JSON вместе с ревизией git, чтобы сравнивать
+прогоны между коммитами (--compare).
+
+Нужен PostgreSQL со схемой после `alembic upgrade head`, урл берётся
+из DATABASE_URL или .env. SQLite не подходит: схема использует
+pg_trgm, tsvector, массивы и триггеры. Созданные данные удаляются
+после замера, если не указан --keep-data.
+
+Запуск из корня проекта:
+    python -m benchmarks.load --concurrency 32 --duration 60 \\
+        --mix create=20,list=30,filter=15,get=25,patch=5,delete=5 \\
+        --output load.json --compare previous.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+os.environ.setdefault('APP_TITLE', 'benchmark')
+os.environ.setdefault('FIRST_SUPERUSER_EMAIL', 'admin@example.com')
+os.environ.setdefault('FIRST_SUPERUSER_PASSWORD', 'benchmark')
+
+import httpx  # noqa: E402
+from sqlalchemy import delete, select  # noqa: E402
+from sqlalchemy.engine import make_url  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.db import AsyncSessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.references import (  # noqa: E402
+    task_auditors_reference,
+    task_responsibles_reference
+)
+from app.models.stats import task_user_stats  # noqa: E402
+from app.models.task import Task  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+OPERATIONS = ('create', 'list', 'filter', 'get', 'patch', 'delete')
+DEFAULT_MIX = 'create=20,list=30,filter=15,get=25,patch=5,delete=5'
+PASSWORD = 'benchmark-password'
+EMAIL_DOMAIN = 'load.example.com'
+TITLE_WORDS = (
+    'отчёт', 'релиз', 'встреча', 'договор', 'аудит', 'миграция',
+    'счёт', 'звонок', 'презентация', 'проверка',
+)
+
+
+def parse_mix(value: str) -> Dict[str, int]:
+    """Разобрать пропорцию операций вида create=20,list=30."""
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(
+                f'Неизвестная операция {name!r}, '
+                f'доступны: {", ".join(OPERATIONS)}'
+            )
+        mix[name] = int(weight)
+    if not any(mix.values()):
+        raise argparse.ArgumentTypeError('Все веса операций нулевые.')
+    return mix
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Получить перцентиль по ближайшему рангу."""
+    if not sorted_values:
+        return 0.0
+    index = max(0, int(round(fraction * len(sorted_values))) - 1)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+def git_revision() -> Dict[str, Optional[str]]:
+    """Получить текущую ревизию git и признак незакоммиченных правок."""
+    try:
+        revision = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = bool(subprocess.run(
+            ['git', 'status', '--porcelain', '--untracked-files=no'],
+            capture_output=True, text=True, check=True
+        ).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return {'revision': None, 'dirty': None}
+    return {'revision': revision, 'dirty': dirty}
+
+
+class Stats:
+    """Задержки и ошибки операций за время замера."""
+
+    def __init__(self) -> None:
+        self.latencies: Dict[str, List[float]] = {
+            name: [] for name in OPERATIONS
+        }
+        self.errors: Dict[str, int] = dict.fromkeys(OPERATIONS, 0)
+        self.recording = False
+
+    def add(self, name: str, latency: float, ok: bool) -> None:
+        if not self.recording:
+            return
+        self.latencies[name].append(latency)
+        if not ok:
+            self.errors[name] += 1
+
+    def report(self, duration: float) -> Dict[str, dict]:
+        """Собрать итоги по операциям."""
+        report = {}
+        for name in OPERATIONS:
+            latencies = sorted(self.latencies[name])
+            if not latencies:
+                continue
+            report[name] = {
+                'requests': len(latencies),
+                'errors': self.errors[name],
+                'rps': len(latencies) / duration,
+                'p50_ms': percentile(latencies, 0.50) * 1000,
+                'p95_ms': percentile(latencies, 0.95) * 1000,
+                'p99_ms': percentile(latencies, 0.99) * 1000,
+            }
+        return report
+
+
+class VirtualUser:
+    """Пользователь API со своим токеном и своими задачами."""
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        stats: Stats,
+        rng: random.Random,
+    ) -> None:
+        self.client = client
+        self.stats = stats
+        self.rng = rng
+        self.email = f'load-{uuid.uuid4().hex}@{EMAIL_DOMAIN}'
+        self.user_id: Optional[int] = None
+        self.headers: Dict[str, str] = {}
+        self.task_ids: List[int] = []
+        self.peer_ids: List[int] = []
+
+    async def sign_up(self) -> None:
+        """Зарегистрироваться и получить JWT."""
+        response = await self.client.post(
+            '/auth/register',
+            json={'email': self.email, 'password': PASSWORD}
+        )
+        response.raise_for_status()
+        self.user_id = response.json()['id']
+        response = await self.client.post(
+            '/auth/jwt/login',
+            data={'username': self.email, 'password': PASSWORD}
+        )
+        response.raise_for_status()
+        self.headers = {
+            'Authorization': f'Bearer {response.json()["access_token"]}'
+        }
+
+    async def call(
+        self,
+        name: str,
+        method: str,
+        url: str,
+        **kwargs
+    ) -> httpx.Response:
+        start = time.perf_counter()
+        response = await self.client.request(
+            method, url, headers=self.headers, **kwargs
+        )
+        self.stats.add(
+            name,
+            time.perf_counter() - start,
+            response.status_code < 400
+        )
+        return response
+
+    def title(self) -> str:
+        return ' '.join(self.rng.sample(TITLE_WORDS, 3))
+
+    async def create(self) -> None:
+        responsibles = [self.user_id, *self.rng.sample(
+            self.peer_ids, min(2, len(self.peer_ids))
+        )]
+        response = await self.call('create', 'POST', '/tasks/', json={
+            'title': self.title(),
+            'description': 'Задача нагрузочного теста',
+            'responsibles': list(dict.fromkeys(responsibles)),
+            'auditors': self.rng.sample(
+                self.peer_ids, min(1, len(self.peer_ids))
+            ),
+        })
+        if response.status_code == 201:
+            self.task_ids.append(response.json()['id'])
+
+    async def list(self) -> None:
+        await self.call('list', 'GET', '/tasks/', params={'limit': 50})
+
+    async def filter(self) -> None:
+        await self.call('filter', 'GET', '/tasks/', params={
+            'title': self.rng.choice(TITLE_WORDS),
+            'limit': 50,
+        })
+
+    async def get(self) -> None:
+        if not self.task_ids:
+            return await self.create()
+        await self.call(
+            'get', 'GET', f'/tasks/{self.rng.choice(self.task_ids)}'
+        )
+
+    async def patch(self) -> None:
+        if not self.task_ids:
+            return await self.create()
+        await self.call(
+            'patch', 'PATCH', f'/tasks/{self.rng.choice(self.task_ids)}',
+            json={'description': f'Изменено в {time.time()}'}
+        )
+
+    async def delete(self) -> None:
+        if not self.task_ids:
+            return await self.create()
+        task_id = self.task_ids.pop(self.rng.randrange(len(self.task_ids)))
+        await self.call('delete', 'DELETE', f'/tasks/{task_id}')
+
+    async def run(self, mix: Dict[str, int], deadline: float) -> None:
+        names = list(mix)
+        weights = [mix[name] for name in names]
+        while time.perf_counter() < deadline:
+            name = self.rng.choices(names, weights)[0]
+            await getattr(self, name)()
+
+
+async def cleanup(emails_like: str) -> None:
+    """Удалить пользователей нагрузочного теста и их задачи."""
+    async with AsyncSessionLocal() as session:
+        user_ids = select(User.id).where(User.email.like(emails_like))
+        task_ids = select(Task.id).where(Task.creator_id.in_(user_ids))
+        for table in (task_responsibles_reference, task_auditors_reference):
+            await session.execute(delete(table).where(
+                table.c.task_id.in_(task_ids) | table.c.user_id.in_(user_ids)
+            ))
+        await session.execute(delete(Task).where(Task.id.in_(task_ids)))
+        await session.execute(delete(task_user_stats).where(
+            task_user_stats.c.user_id.in_(user_ids)
+        ))
+        await session.execute(delete(User).where(User.id.in_(user_ids)))
+        await session.commit()
+
+
+def print_report(report: Dict[str, dict], previous: Optional[dict]) -> None:
+    print(
+        f'{"операция":10} {"запросов":>9} {"ошибок":>7} {"rps":>9} '
+        f'{"p50, мс":>9} {"p95, мс":>9} {"p99, мс":>9}'
+    )
+    for name, row in report.items():
+        line = (
+            f'{name:10} {row["requests"]:9d} {row["errors"]:7d} '
+            f'{row["rps"]:9.1f} {row["p50_ms"]:9.2f} '
+            f'{row["p95_ms"]:9.2f} {row["p99_ms"]:9.2f}'
+        )
+        before = (previous or {}).get('operations', {}).get(name)
+        if before:
+            line += (
+                f'   p95 {row["p95_ms"] - before["p95_ms"]:+.2f} мс, '
+                f'rps {row["rps"] - before["rps"]:+.1f}'
+            )
+        print(line)
+
+
+async def main(args) -> dict:
+    if make_url(settings.database_url).get_backend_name() != 'postgresql':
+        sys.exit('Нагрузочный тест требует PostgreSQL.')
+
+    rng = random.Random(args.seed)
+    stats = Stats()
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(
+            transport=transport,
+            base_url='http://benchmark'
+        ) as client:
+            users = [
+                VirtualUser(client, stats, random.Random(rng.random()))
+                for _ in range(args.concurrency)
+            ]
+            try:
+                for user in users:
+                    await user.sign_up()
+                peer_ids = [user.user_id for user in users]
+                for user in users:
+                    user.peer_ids = peer_ids
+                    for _ in range(args.seed_tasks):
+                        await user.create()
+
+                warmup_deadline = time.perf_counter() + args.warmup
+                await asyncio.gather(*(
+                    user.run(args.mix, warmup_deadline) for user in users
+                ))
+                stats.recording = True
+                start = time.perf_counter()
+                await asyncio.gather(*(
+                    user.run(args.mix, start + args.duration)
+                    for user in users
+                ))
+                elapsed = time.perf_counter() - start
+                stats.recording = False
+            finally:
+                if not args.keep_data:
+                    await cleanup(f'%@{EMAIL_DOMAIN}')
+    await engine.dispose()
+
+    report = stats.report(elapsed)
+    total = sum(row['requests'] for row in report.values())
+    return {
+        **git_revision(),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'parameters': {
+            'concurrency': args.concurrency,
+            'duration': args.duration,
+            'warmup': args.warmup,
+            'seed_tasks': args.seed_tasks,
+            'mix': args.mix,
+            'seed': args.seed,
+        },
+        'total_requests': total,
+        'total_rps': total / elapsed,
+        'operations': report,
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=30)
+    parser.add_argument('--warmup', type=float, default=5)
+    parser.add_argument('--seed-tasks', type=int, default=20)
+    parser.add_argument('--mix', type=parse_mix, default=DEFAULT_MIX)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='Файл для результата в JSON')
+    parser.add_argument('--compare', help='Результат прошлого прогона')
+    parser.add_argument('--keep-data', action='store_true')
+    args = parser.parse_args()
+
+    previous = None
+    if args.compare:
+        with open(args.compare) as file:
+            previous = json.load(file)
+    result = asyncio.run(main(args))
+    print_report(result['operations'], previous)
+    print(
+        f'всего: {result["total_requests"]} запросов, '
+        f'{result["total_rps"]:.1f} rps, ревизия {result["revision"]}'
+    )
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(result, file, ensure_ascii=False, indent=2)
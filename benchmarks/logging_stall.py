@@ -0,0 +1,146 @@
+"""
+Задержки цикла событий при логировании: StreamHandler и очередь.
+
+До: StreamHandler с f-строкой пишет прямо из цикла событий - прежний
+configure_logger. После: ContextQueueHandler из app.core.log с
+ленивым форматированием, вывод в отдельном потоке. Вывод идёт в канал
+с медленным читателем, как stderr под нагрузкой у сборщика логов.
+Задержка цикла измеряется сопрограммой, которая засыпает на interval
+и фиксирует опоздание пробуждения.
+
+Запуск из корня проекта:
+    python -m benchmarks.logging_stall --messages 20000 --workers 50
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import threading
+import time
+
+from app.core.log import build_pipeline
+
+FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+
+class SlowPipe:
+    """Канал, читатель которого забирает данные с задержкой."""
+
+    def __init__(self, chunk: int, delay: float) -> None:
+        read_fd, write_fd = os.pipe()
+        self.stream = os.fdopen(write_fd, 'w', buffering=1)
+        self._reader = os.fdopen(read_fd, 'rb', buffering=0)
+        self._thread = threading.Thread(
+            target=self._drain, args=(chunk, delay), daemon=True
+        )
+        self._thread.start()
+
+    def _drain(self, chunk: int, delay: float) -> None:
+        while self._reader.read(chunk):
+            time.sleep(delay)
+
+    def close(self) -> None:
+        self.stream.close()
+        self._thread.join()
+        self._reader.close()
+
+
+async def probe(interval: float, lags: list, done: asyncio.Event) -> None:
+    """Замерять опоздание пробуждений цикла событий."""
+    loop = asyncio.get_running_loop()
+    while not done.is_set():
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, loop.time() - expected))
+
+
+async def workload(logger, lazy: bool, workers: int, messages: int) -> None:
+    """Писать сообщения из нескольких сопрограмм, как обработчики API."""
+
+    async def worker(number: int) -> None:
+        for index in range(messages // workers):
+            if lazy:
+                logger.info(
+                    'Задача %s изменена пользователем %s', index, number
+                )
+            else:
+                logger.info(
+                    f'Задача {index} изменена пользователем {number}'
+                )
+            await asyncio.sleep(0)
+
+    await asyncio.gather(*(worker(number) for number in range(workers)))
+
+
+async def run(name: str, args) -> dict:
+    pipe = SlowPipe(args.reader_chunk, args.reader_delay / 1000)
+    logger = logging.getLogger(f'benchmark.{name}')
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    listener = None
+    if name == 'queue':
+        handler, listener = build_pipeline(
+            logging.Formatter(FORMAT),
+            queue_size=args.messages,
+            stream=pipe.stream
+        )
+        listener.start()
+    else:
+        handler = logging.StreamHandler(pipe.stream)
+        handler.setFormatter(logging.Formatter(FORMAT))
+    logger.addHandler(handler)
+
+    lags, done = [], asyncio.Event()
+    probe_task = asyncio.create_task(
+        probe(args.interval / 1000, lags, done)
+    )
+    start = time.perf_counter()
+    await workload(logger, name == 'queue', args.workers, args.messages)
+    elapsed = time.perf_counter() - start
+    done.set()
+    await probe_task
+
+    logger.removeHandler(handler)
+    if listener is not None:
+        listener.stop()
+    pipe.close()
+    lags = sorted(lags) or [0.0]
+    return {
+        'elapsed_s': elapsed,
+        'lag_p50_ms': statistics.median(lags) * 1000,
+        'lag_p99_ms': lags[int(len(lags) * 0.99) - 1] * 1000,
+        'lag_max_ms': lags[-1] * 1000,
+        'dropped': getattr(handler, 'dropped', 0),
+    }
+
+
+def main(args) -> None:
+    for name, title in (
+        ('sync', 'StreamHandler'),
+        ('queue', 'очередь'),
+    ):
+        result = asyncio.run(run(name, args))
+        print(
+            f'{title:14} время: {result["elapsed_s"]:6.2f} с  '
+            f'задержка цикла p50: {result["lag_p50_ms"]:7.2f} мс  '
+            f'p99: {result["lag_p99_ms"]:7.2f} мс  '
+            f'макс: {result["lag_max_ms"]:7.2f} мс  '
+            f'отброшено: {result["dropped"]}'
+        )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--messages', type=int, default=20000)
+    parser.add_argument('--workers', type=int, default=50)
+    parser.add_argument(
+        '--interval', type=float, default=1,
+        help='Период пробуждения измеряющей сопрограммы, мс'
+    )
+    parser.add_argument('--reader-chunk', type=int, default=4096)
+    parser.add_argument(
+        '--reader-delay', type=float, default=5,
+        help='Пауза читателя канала между порциями, мс'
+    )
+    main(parser.parse_args())
@@ -0,0 +1,187 @@
+"""
+Сравнение создания одной задачи: прежний ORM-путь и TaskCRUD.create.
+
+Для каждого пути считаются обращения к базе данных на одно создание
+(запросы и COMMIT) и задержки p50/p99. Нужен PostgreSQL со схемой
+после `alembic upgrade head`, урл берётся из DATABASE_URL или .env.
+Созданные данные удаляются после замера.
+
+Запуск из корня проекта:
+    python -m benchmarks.task_create --count 500
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+import uuid
+import warnings
+
+os.environ.setdefault('APP_TITLE', 'benchmark')
+os.environ.setdefault('FIRST_SUPERUSER_EMAIL', 'admin@example.com')
+os.environ.setdefault('FIRST_SUPERUSER_PASSWORD', 'benchmark')
+
+from sqlalchemy import delete, event, insert, select  # noqa: E402
+from sqlalchemy.exc import SAWarning  # noqa: E402
+from sqlalchemy.orm import selectinload  # noqa: E402
+
+from app.core.db import AsyncSessionLocal, engine  # noqa: E402
+from app.crud.task import task_crud  # noqa: E402
+from app.models.references import (  # noqa: E402
+    task_auditors_reference,
+    task_responsibles_reference
+)
+from app.models.stats import task_user_stats  # noqa: E402
+from app.models.task import Task  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.schemas.task import TaskCreate  # noqa: E402
+
+
+class RoundTripCounter:
+    """Счётчик запросов и COMMIT, отправленных движком."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        event.listen(engine.sync_engine, 'before_cursor_execute', self.hit)
+        event.listen(engine.sync_engine, 'commit', self.hit)
+
+    def hit(self, *args, **kwargs) -> None:
+        self.count += 1
+
+
+async def legacy_create(obj_in: TaskCreate, user: User, session) -> Task:
+    """Прежняя реализация TaskCRUD.create."""
+    create_data = obj_in.model_dump()
+    create_data['creator_id'] = user.id
+    create_data.pop('responsibles', [])
+    auditors = create_data.pop('auditors', [])
+
+    db_obj = Task(**create_data)
+    responsibles = await session.execute(
+        select(User).where(User.id.in_(obj_in.responsibles))
+    )
+    for responsible_user in responsibles.scalars().all():
+        db_obj.responsibles.append(responsible_user)
+    if auditors:
+        auditors = await session.execute(
+            select(User).where(User.id.in_(obj_in.auditors))
+        )
+        for auditor_user in auditors.scalars().all():
+            db_obj.auditors.append(auditor_user)
+
+    session.add(db_obj)
+    await session.commit()
+
+    result = await session.execute(
+        select(Task).options(
+            selectinload(Task.responsibles),
+            selectinload(Task.auditors)
+        ).where(Task.id == db_obj.id)
+    )
+    return result.scalars().first()
+
+
+async def current_create(obj_in: TaskCreate, user: User, session) -> dict:
+    return await task_crud.create(obj_in=obj_in, user=user, session=session)
+
+
+async def create_users(count: int) -> list:
+    """Создать пользователей для назначения в задачи."""
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            insert(User).returning(User.id),
+            [
+                {
+                    'email': f'bench-{uuid.uuid4().hex}@example.com',
+                    'hashed_password': '-',
+                    'is_active': True,
+                    'is_superuser': False,
+                    'is_verified': False,
+                }
+                for _ in range(count)
+            ]
+        )
+        user_ids = result.scalars().all()
+        await session.commit()
+    return user_ids
+
+
+async def cleanup(task_ids: list, user_ids: list) -> None:
+    """Удалить созданные при замере задачи и пользователей."""
+    async with AsyncSessionLocal() as session:
+        for table in (task_responsibles_reference, task_auditors_reference):
+            await session.execute(
+                delete(table).where(table.c.task_id.in_(task_ids))
+            )
+        await session.execute(delete(Task).where(Task.id.in_(task_ids)))
+        # Триггеры обнулили счётчики, но строки статистики остались.
+        await session.execute(
+            delete(task_user_stats).where(
+                task_user_stats.c.user_id.in_(user_ids)
+            )
+        )
+        await session.execute(delete(User).where(User.id.in_(user_ids)))
+        await session.commit()
+
+
+async def measure(create, user_ids: list, count: int, counter) -> tuple:
+    """Создать count задач и собрать задержки и число обращений."""
+    latencies, round_trips, task_ids = [], [], []
+    for index in range(count):
+        obj_in = TaskCreate(
+            title=f'Задача {index}',
+            description='Описание задачи',
+            responsibles=user_ids[:3],
+            auditors=user_ids[3:],
+        )
+        async with AsyncSessionLocal() as session:
+            creator = await session.get(User, user_ids[0])
+            before = counter.count
+            start = time.perf_counter()
+            task = await create(obj_in, creator, session)
+            latencies.append(time.perf_counter() - start)
+            round_trips.append(counter.count - before)
+        task_ids.append(task['id'] if isinstance(task, dict) else task.id)
+
+    latencies.sort()
+    return {
+        'round_trips_per_create': statistics.mean(round_trips),
+        'p50_ms': latencies[len(latencies) // 2] * 1000,
+        'p99_ms': latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }, task_ids
+
+
+async def main(count: int) -> None:
+    # Прежний путь связывает пользователей с задачей до session.add,
+    # и autoflush на каждом создании предупреждает об этом.
+    warnings.filterwarnings(
+        'ignore', 'Object of type <Task> not in session', SAWarning
+    )
+    counter = RoundTripCounter()
+    user_ids = await create_users(6)
+    task_ids = []
+    try:
+        for name, create in (
+            ('прежний путь', legacy_create),
+            ('TaskCRUD.create', current_create),
+        ):
+            result, created_ids = await measure(
+                create, user_ids, count, counter
+            )
+            task_ids.extend(created_ids)
+            print(
+                f'{name:16} обращений: '
+                f'{result["round_trips_per_create"]:5.1f}  '
+                f'p50: {result["p50_ms"]:7.2f} мс  '
+                f'p99: {result["p99_ms"]:7.2f} мс'
+            )
+    finally:
+        await cleanup(task_ids, user_ids)
+        await engine.dispose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--count', type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main(args.count))
@@ -0,0 +1,54 @@
+"""
+Общие фикстуры тестов.
+
+Тесты с базой данных идут на DATABASE_URL из настроек, схема должна
+быть создана заранее: alembic upgrade head. Если база недоступна
+или не размечена, такие тесты пропускаются.
+"""
+import pytest
+from sqlalchemy import inspect
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+import app.core.base  # noqa: F401 - регистрирует все модели
+from app.core.config import settings
+
+
+@pytest.fixture
+def anyio_backend():
+    return 'asyncio'
+
+
+async def connect(engine):
+    """
+    Открыть соединение с тестовой базой.
+    Если база недоступна или схема не создана, тест пропускается.
+    """
+    try:
+        connection = await engine.connect()
+    except (DBAPIError, OSError) as e:
+        await engine.dispose()
+        pytest.skip(f'База данных недоступна - {e}')
+    tables = await connection.run_sync(
+        lambda sync: inspect(sync).get_table_names()
+    )
+    if 'task' not in tables:
+        await connection.close()
+        await engine.dispose()
+        pytest.skip('Схема не создана: выполните alembic upgrade head')
+    return connection
+
+
+@pytest.fixture
+async def connection():
+    """
+    Получить соединение с тестовой базой.
+    Всё, что тест выполнил, откатывается после него.
+    """
+    engine = create_async_engine(settings.database_url, poolclass=NullPool)
+    connection = await connect(engine)
+    yield connection
+    await connection.rollback()
+    await connection.close()
+    await engine.dispose()
@@ -0,0 +1,52 @@
+"""Тесты плагина pytest app.testing.query_budget."""
+pytest_plugins = ['pytester']
+
+TEST_MODULE = '''
+import pytest
+from sqlalchemy import create_engine, text
+
+engine = create_engine('sqlite://')
+
+
+def run_queries(count):
+    with engine.connect() as connection:
+        for _ in range(count):
+            connection.execute(text('SELECT 1'))
+
+
+@pytest.mark.query_budget(2)
+def test_marker_within_budget():
+    run_queries(2)
+
+
+@pytest.mark.query_budget(2)
+def test_marker_over_budget():
+    run_queries(3)
+
+
+def test_fixture_within_budget(query_budget):
+    run_queries(5)
+    with query_budget(1):
+        run_queries(1)
+
+
+def test_fixture_over_budget(query_budget):
+    with query_budget(1):
+        run_queries(2)
+'''
+
+
+def test_budget_overrun_is_reported(pytester):
+    pytester.makepyfile(TEST_MODULE)
+    result = pytester.runpytest('-p', 'app.testing.query_budget')
+
+    result.assert_outcomes(passed=2, failed=2)
+    result.stdout.fnmatch_lines([
+        '*test_marker_over_budget*',
+        'Выполнено 3 SQL-запросов при бюджете 2:',
+        '  3 x SELECT 1',
+    ])
+    result.stdout.fnmatch_lines([
+        '*test_fixture_over_budget*',
+        'Выполнено 2 SQL-запросов при бюджете 1:',
+    ])
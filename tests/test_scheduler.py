@@ -0,0 +1,67 @@
+"""Тесты блокировки фоновых задач."""
+import asyncio
+
+import pytest
+from sqlalchemy import text
+
+from app.core.db import engine
+from app.core.scheduler import PeriodicJob
+
+pytestmark = pytest.mark.anyio
+
+LOCK_KEY = 7_342_999
+
+LOCK_STATE = text(
+    'SELECT activity.state FROM pg_locks AS locks '
+    'JOIN pg_stat_activity AS activity USING (pid) '
+    "WHERE locks.locktype = 'advisory' AND locks.objid = :key"
+)
+
+
+@pytest.fixture
+async def lock_state(connection):
+    """Получить состояние соединения, держащего блокировку задачи."""
+    async def state():
+        result = await connection.execute(LOCK_STATE, {'key': LOCK_KEY})
+        await connection.commit()
+        return result.scalar()
+    yield state
+    # Пул привязан к циклу событий теста.
+    await engine.dispose()
+
+
+async def test_lock_connection_is_not_idle_in_transaction(lock_state):
+    states = []
+
+    async def job():
+        states.append(await lock_state())
+
+    assert await PeriodicJob('test', 1, LOCK_KEY, job).run_once()
+    assert states == ['idle']
+    assert await lock_state() is None
+
+
+async def test_failed_job_releases_lock(lock_state):
+    async def job():
+        raise RuntimeError('сбой')
+
+    with pytest.raises(RuntimeError):
+        await PeriodicJob('test', 1, LOCK_KEY, job).run_once()
+    assert await lock_state() is None
+
+
+async def test_cancelled_job_releases_lock(lock_state):
+    started = asyncio.Event()
+
+    async def job():
+        started.set()
+        await asyncio.sleep(60)
+
+    task = asyncio.create_task(
+        PeriodicJob('test', 1, LOCK_KEY, job).run_once()
+    )
+    await started.wait()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert await lock_state() is None
@@ -0,0 +1,95 @@
+"""Тесты создания задачи через POST /tasks/."""
+import httpx
+import pytest
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db import get_async_session
+from app.core.user import current_user
+from app.main import app
+from app.models.task import Task
+from app.models.user import User
+
+pytestmark = pytest.mark.anyio
+
+UNKNOWN_USER_ID = 2 ** 31 - 1
+
+
+@pytest.fixture
+async def session(connection):
+    """
+    Получить сессию внутри транзакции теста: COMMIT и ROLLBACK
+    приложения работают с точками сохранения и откатываются с тестом.
+    """
+    async with AsyncSession(
+        bind=connection,
+        expire_on_commit=False,
+        join_transaction_mode='create_savepoint',
+    ) as session:
+        yield session
+
+
+@pytest.fixture
+async def creator(session):
+    user_id = await session.scalar(
+        insert(User).values(
+            email='create-test@example.com',
+            hashed_password='-',
+            is_active=True,
+            is_superuser=False,
+            is_verified=True,
+        ).returning(User.id)
+    )
+    return await session.get(User, user_id)
+
+
+@pytest.fixture
+async def client(session, creator):
+    async def get_session():
+        yield session
+
+    app.dependency_overrides[get_async_session] = get_session
+    app.dependency_overrides[current_user] = lambda: creator
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url='http://test'
+    ) as client:
+        yield client
+    app.dependency_overrides.clear()
+
+
+async def count_tasks(session, title: str) -> int:
+    return await session.scalar(
+        select(func.count()).select_from(Task).where(Task.title == title)
+    )
+
+
+async def test_create_task_with_known_users(client, session, creator):
+    response = await client.post('/tasks/', json={
+        'title': 'Известные пользователи',
+        'responsibles': [creator.id],
+        'auditors': [creator.id],
+    })
+    assert response.status_code == 201
+    body = response.json()
+    assert body['responsibles'] == [
+        {'id': creator.id, 'email': creator.email}
+    ]
+    assert body['auditors'] == body['responsibles']
+    assert await count_tasks(session, 'Известные пользователи') == 1
+
+
+@pytest.mark.parametrize('field', ['responsibles', 'auditors'])
+async def test_create_task_rejects_unknown_users(
+    client, session, creator, field
+):
+    payload = {
+        'title': 'Неизвестные пользователи',
+        'responsibles': [creator.id],
+        'auditors': [],
+    }
+    payload[field] = [creator.id, UNKNOWN_USER_ID]
+    response = await client.post('/tasks/', json=payload)
+    assert response.status_code == 400
+    assert str(UNKNOWN_USER_ID) in response.json()['detail']
+    assert await count_tasks(session, 'Неизвестные пользователи') == 0
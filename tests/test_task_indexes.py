@@ -0,0 +1,198 @@
+"""
+Регрессионные тесты индексов задач.
+
+Перед тестами модуля в транзакции загружаются синтетические данные
+app.core.seed и собирается статистика ANALYZE, после тестов всё
+откатывается. Планы строятся с настройками планировщика по умолчанию,
+поэтому тесты ловят и индекс, который запросу подходит, но
+планировщик его не выбрал бы: неверный порядок колонок, нет DESC.
+"""
+from datetime import datetime, timedelta
+from typing import Set
+
+import pytest
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.core.seed import SEEDED_TABLES, load, parse_args
+from app.crud.task import task_crud
+from app.models.references import task_responsibles_reference
+from app.models.task import Task
+from app.schemas.task import TaskUserRole
+
+from tests.conftest import connect
+
+pytestmark = pytest.mark.anyio
+
+# Данных должно хватать, чтобы полный просмотр таблицы был дороже
+# индексного: на маленькой таблице планировщик верно выбрал бы его.
+SEED_ARGS = [
+    '--users', '2000',
+    '--tasks', '20000',
+    '--email-prefix', 'index-test-',
+]
+
+INDEX_SCANS = ('Index Scan', 'Index Only Scan', 'Bitmap Index Scan')
+
+
+def scanned_indexes(plan: dict) -> Set[str]:
+    """Получить имена индексов, которые просматривает план."""
+    indexes = set()
+    if plan['Node Type'] in INDEX_SCANS:
+        indexes.add(plan['Index Name'])
+    for child in plan.get('Plans', ()):
+        indexes |= scanned_indexes(child)
+    return indexes
+
+
+def limited_index_scans(plan: dict) -> Set[str]:
+    """
+    Получить индексы, просмотр которых прерывает LIMIT: строки
+    читаются из индекса уже в нужном порядке и без сортировки.
+    """
+    indexes = set()
+    for child in plan.get('Plans', ()):
+        if plan['Node Type'] == 'Limit' and child['Node Type'] in INDEX_SCANS:
+            indexes.add(child['Index Name'])
+        indexes |= limited_index_scans(child)
+    return indexes
+
+
+@pytest.fixture(scope='module')
+def anyio_backend():
+    return 'asyncio'
+
+
+@pytest.fixture(scope='module')
+async def seeded():
+    """
+    Получить соединение с загруженными синтетическими данными
+    и собранной статистикой. Данные откатываются после тестов модуля.
+    """
+    engine = create_async_engine(settings.database_url, poolclass=NullPool)
+    connection = await connect(engine)
+    raw_connection = await connection.get_raw_connection()
+    await load(raw_connection.driver_connection, parse_args(SEED_ARGS))
+    await connection.execute(text(
+        'ANALYZE ' + ', '.join(f'"{table}"' for table in SEEDED_TABLES)
+    ))
+    yield connection
+    await connection.rollback()
+    await connection.close()
+    await engine.dispose()
+
+
+async def explain_plan(connection, query) -> dict:
+    """Получить план запроса EXPLAIN (FORMAT JSON)."""
+    statement = query.compile(
+        dialect=connection.dialect,
+        compile_kwargs={'literal_binds': True}
+    )
+    result = await connection.execute(
+        text(f'EXPLAIN (FORMAT JSON) {statement}')
+    )
+    return result.scalar()[0]['Plan']
+
+
+async def explain(connection, query) -> Set[str]:
+    """Получить индексы из плана запроса."""
+    return scanned_indexes(await explain_plan(connection, query))
+
+
+async def least_active(connection, column) -> int:
+    """Получить пользователя с наименьшим числом строк в колонке."""
+    return await connection.scalar(
+        select(column).group_by(column).order_by(func.count(), column)
+        .limit(1)
+    )
+
+
+async def most_active(connection, column) -> int:
+    """Получить пользователя с наибольшим числом строк в колонке."""
+    return await connection.scalar(
+        select(column).group_by(column)
+        .order_by(func.count().desc(), column).limit(1)
+    )
+
+
+async def test_date_filter_uses_create_date_index(seeded):
+    week_ago = datetime.now() - timedelta(days=7)
+    query = task_crud._page_query(
+        title=None,
+        start_date=week_ago.date(),
+        end_date=None,
+        limit=50,
+    )
+    assert 'ix_task_create_date_id' in await explain(seeded, query)
+
+
+async def test_keyset_page_uses_create_date_index(seeded):
+    query = task_crud._page_query(
+        title=None,
+        start_date=None,
+        end_date=None,
+        limit=50,
+        cursor=(datetime.now() - timedelta(days=30), 1000),
+    )
+    assert 'ix_task_create_date_id' in await explain(seeded, query)
+
+
+async def test_creator_tasks_use_creator_index(seeded):
+    query = task_crud._user_tasks_query(
+        user_id=await least_active(seeded, Task.creator_id),
+        role=TaskUserRole.creator,
+        title=None,
+        start_date=None,
+        end_date=None,
+        limit=50,
+    )
+    assert (
+        'ix_task_creator_id_create_date_id' in await explain(seeded, query)
+    )
+
+
+@pytest.mark.parametrize('role', [TaskUserRole.creator, TaskUserRole.any])
+async def test_mine_page_reads_creator_tasks_in_page_order(seeded, role):
+    # Без составного индекса страница задач самого активного
+    # создателя требует сортировки всех его задач.
+    query = task_crud._user_tasks_query(
+        user_id=await most_active(seeded, Task.creator_id),
+        role=role,
+        title=None,
+        start_date=None,
+        end_date=None,
+        limit=50,
+        cursor=(datetime.now() - timedelta(days=30), 10 ** 9),
+    )
+    plan = await explain_plan(seeded, query)
+    assert 'ix_task_creator_id_create_date_id' in limited_index_scans(plan)
+
+
+async def test_responsible_tasks_use_reference_index(seeded):
+    user_id = await least_active(
+        seeded, task_responsibles_reference.c.user_id
+    )
+    query = select(task_responsibles_reference.c.task_id).where(
+        task_responsibles_reference.c.user_id == user_id
+    )
+    assert (
+        'ix_task_responsibles_reference_user_id'
+        in await explain(seeded, query)
+    )
+
+
+async def test_active_expiration_uses_partial_index(seeded):
+    query = select(Task.id).where(
+        Task.is_active,
+        Task.expiration_date < datetime.now() - timedelta(days=300),
+    )
+    assert (
+        'ix_task_expiration_date_active' in await explain(seeded, query)
+    )
+
+
+async def test_search_uses_search_vector_index(seeded):
+    query = task_crud._search_query('отчёт по аудиту', limit=20)
+    assert 'ix_task_search_vector' in await explain(seeded, query)
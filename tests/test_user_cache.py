@@ -0,0 +1,61 @@
+"""Тесты согласования кэша пользователей между воркерами."""
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.core.user_cache import USER_CACHE_CHANNEL, SharedUserCache
+
+pytestmark = pytest.mark.anyio
+
+
+async def wait_for(condition, timeout: float = 5) -> bool:
+    """Дождаться выполнения условия."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not condition():
+        if loop.time() > deadline:
+            return False
+        await asyncio.sleep(0.01)
+    return True
+
+
+@pytest.fixture
+async def user_cache(connection):
+    cache = SharedUserCache(maxsize=10, ttl=60, retry_interval=0.5)
+    cache.start(settings.database_url)
+    assert await wait_for(lambda: cache.listening)
+    yield cache
+    await cache.stop()
+
+
+async def test_cache_is_bypassed_without_listener():
+    cache = SharedUserCache(maxsize=10, ttl=60, retry_interval=0.5)
+    cache.set(1, {'id': 1}, cache.generation)
+    assert cache.get(1) is None
+
+
+async def test_notify_from_other_worker_drops_user(user_cache, connection):
+    user_cache.set(1, {'id': 1}, user_cache.generation)
+    user_cache.set(2, {'id': 2}, user_cache.generation)
+    await connection.execute(
+        select(func.pg_notify(USER_CACHE_CHANNEL, '1'))
+    )
+    await connection.commit()
+    assert await wait_for(lambda: user_cache.get(1) is None)
+    assert user_cache.get(2) == {'id': 2}
+
+
+async def test_row_read_before_drop_is_not_cached(user_cache):
+    generation = user_cache.generation
+    user_cache.drop(1)
+    user_cache.set(1, {'id': 1, 'is_active': True}, generation)
+    assert user_cache.get(1) is None
+
+
+async def test_stop_disables_cache(user_cache):
+    user_cache.set(1, {'id': 1}, user_cache.generation)
+    await user_cache.stop()
+    assert not user_cache.listening
+    assert user_cache.get(1) is None